@@ -7,6 +7,7 @@ import nuke  # type: ignore
 import os
 from . import src as vina_scripter
 from .nuke_util import panels
+from .nuke_util.pyside import QTimer
 from .nuke_util.nuke_util import get_nuke_path
 
 from .src.script_output import get_nuke_console
@@ -14,6 +15,10 @@ from .src.script_output import get_nuke_console
 
 nuke_console = None
 nuke_console_connected = False
+consoles_update_pending = False
+
+CONNECT_INTERVAL = 250
+CONNECT_MAX_INTERVAL = 8000
 
 
 def setup():
@@ -34,20 +39,29 @@ def setup():
     nuke.menu('Animation').addCommand(
         'Tcl Expression', source + '.edit_expression(True)')
 
-    nuke.addUpdateUI(connect_to_nuke_console)
+    connect_to_nuke_console_later()
+
+
+def connect_to_nuke_console_later(interval=CONNECT_INTERVAL):
+    if connect_to_nuke_console():
+        return
+
+    next_interval = min(interval * 2, CONNECT_MAX_INTERVAL)
+    QTimer.singleShot(
+        interval, lambda: connect_to_nuke_console_later(next_interval))
 
 
 def connect_to_nuke_console(connect=True):
     global nuke_console, nuke_console_connected
 
     if nuke_console_connected == connect:
-        return
+        return nuke_console_connected
 
     if not nuke_console:
         nuke_console = get_nuke_console()
 
     if not nuke_console:
-        return
+        return nuke_console_connected
 
     if connect:
         nuke_console.textChanged.connect(update_consoles)
@@ -55,16 +69,29 @@ def connect_to_nuke_console(connect=True):
         nuke_console.textChanged.disconnect()
 
     nuke_console_connected = connect
+    return nuke_console_connected
 
 
 def update_consoles():
+    global consoles_update_pending
+
+    if consoles_update_pending:
+        return
+
+    consoles_update_pending = True
+    QTimer.singleShot(0, refresh_consoles)
+
+
+def refresh_consoles():
+    global consoles_update_pending
+    consoles_update_pending = False
+
     panel_widget = nuke.panels['vina_scripter']()
     float_widget = nuke.float_panels['vina_scripter']
 
-    if panel_widget:
-        panel_widget.scripter.console.update_output()
-
-    float_widget.scripter.console.update_output()
+    for widget in [panel_widget, float_widget]:
+        if widget and widget.isVisible():
+            widget.scripter.console.update_output()
 
 
 def get_scripter_panel():
@@ -6,6 +6,29 @@ from . import (
     scripter_panel,
     editor,
     script_output,
+    output_capture,
+    output_log,
+    output_sections,
+    widget_locator,
+    bounded_cache,
+    expressions,
+    expression_range,
+    expression_bake,
+    compiled_expressions,
+    expression_convert,
+    expression_numpy,
+    comp_knobs,
+    expression_profiler,
+    expression_graph,
+    knob_index,
+    batch,
+    comp_replace,
+    page_namespaces,
+    page_cells,
+    execution,
+    run_profile,
+    line_profile,
+    timing,
     toolbar,
     keys_normal_mode,
     vim)
@@ -0,0 +1,147 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+from contextlib import contextmanager
+
+import nuke  # type: ignore
+
+from ..nuke_util.pyside import QApplication
+
+
+@contextmanager
+def undo_group(name):
+    nuke.Undo.begin(name)
+
+    try:
+        yield
+    finally:
+        nuke.Undo.end()
+
+
+@contextmanager
+def suspended_callbacks(scripter=None, names=('knobChangeds',)):
+    # The global callbacks live in dicts of nuke.callbacks, they are emptied
+    # in place so that Nuke's dispatchers find nothing to call, the knobChanged
+    # knobs of the nodes themselves still run.
+    saved = {}
+
+    for name in names:
+        callbacks = getattr(nuke.callbacks, name)
+        saved[name] = dict(callbacks)
+        callbacks.clear()
+
+    if scripter:
+        scripter.activated_knob_changed = False
+
+    try:
+        yield
+    finally:
+        for name, previous in saved.items():
+            callbacks = getattr(nuke.callbacks, name)
+
+            # callbacks added while suspended are kept after the previous ones
+            for key, funcs in previous.items():
+                added = [f for f in callbacks.get(key, []) if not f in funcs]
+                callbacks[key] = funcs + added
+
+        if scripter:
+            scripter.activated_knob_changed = True
+
+
+class knob_recorder(object):
+    def __init__(self):
+        self.touched = []
+        self.seen = set()
+
+    def record(self):
+        key = (nuke.thisNode().fullName(), nuke.thisKnob().name())
+
+        if not key in self.seen:
+            self.seen.add(key)
+            self.touched.append(key)
+
+    def replay(self):
+        # the suspended callbacks run once per touched knob, in the order the
+        # knobs were first changed, runIn gives them thisNode and thisKnob
+        failed = 0
+
+        for node_name, knob_name in self.touched:
+            try:
+                nuke.runIn('{}.{}'.format(node_name, knob_name),
+                           "__import__('nuke').callbacks.knobChanged()")
+            except Exception:
+                failed += 1
+
+        for node_name in set(node_name for node_name, _ in self.touched):
+            try:
+                nuke.runIn(node_name, "__import__('nuke').callbacks.updateUI()")
+            except Exception:
+                failed += 1
+
+        return failed
+
+
+@contextmanager
+def deferred_callbacks(scripter=None):
+    # Like suspended_callbacks, but the changed knobs are recorded so that the
+    # callbacks can be replayed with recorder.replay() once the batch is done,
+    # usually after its undo group is closed.
+    recorder = knob_recorder()
+    entry = (recorder.record, (), {}, None)
+
+    with suspended_callbacks(scripter, ('knobChangeds', 'updateUIs')):
+        callbacks = nuke.callbacks.knobChangeds
+        callbacks['*'] = [entry]
+
+        try:
+            yield recorder
+        finally:
+            callbacks['*'] = [f for f in callbacks.get('*', []) if not f == entry]
+
+
+@contextmanager
+def suspended_repaint():
+    # Qt skips the paint events of the windows, the viewer, DAG and
+    # properties are drawn once when the batch ends
+    windows = [w for w in QApplication.topLevelWidgets()
+               if w.isVisible() and w.updatesEnabled()]
+
+    for window in windows:
+        window.setUpdatesEnabled(False)
+
+    try:
+        yield
+    finally:
+        for window in windows:
+            window.setUpdatesEnabled(True)
+
+
+@contextmanager
+def suspended_autosave():
+    preferences = nuke.toNode('preferences')
+    knob = preferences.knob('AutoSaveTime') if preferences else None
+
+    if not knob:
+        yield
+        return
+
+    autosave_time = knob.value()
+    knob.setValue(0)
+
+    try:
+        yield
+    finally:
+        knob.setValue(autosave_time)
+
+
+@contextmanager
+def fast_run(scripter, active=True):
+    if not active:
+        yield
+        return
+
+    with suspended_autosave(), suspended_repaint(), \
+            suspended_callbacks(scripter, ('knobChangeds', 'updateUIs')):
+        yield
@@ -0,0 +1,57 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+
+
+def source_hash(code):
+    # short key of a source code for the caches
+    return hashlib.md5(code.encode('utf-8')).hexdigest()[:12]
+
+
+class bounded_cache(object):
+    def __init__(self, max_size=256, lru=True):
+        self.max_size = max_size
+        self.lru = lru
+        self.items = OrderedDict()
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def get(self, key, default=None):
+        if not self.lru:
+            # hit path of expressions evaluated every frame and on render
+            # threads, a single lookup without reordering or locking, the
+            # eviction follows the insertion order
+            return self.items.get(key, default)
+
+        with self.lock:
+            if not key in self.items:
+                return default
+
+            value = self.items.pop(key)
+            self.items[key] = value
+
+            return value
+
+    def set(self, key, value):
+        # the first item is evicted, the least recently used one when
+        # get reorders the items
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = value
+
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
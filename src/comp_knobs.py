@@ -0,0 +1,30 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import nuke  # type: ignore
+
+
+def all_nodes():
+    return nuke.allNodes(recurseGroups=True)
+
+
+def expression_dimensions(scripter, knob):
+    for dimension, expr in enumerate(scripter.get_raw_expression(knob)):
+        if not expr:
+            continue
+
+        if scripter.is_python_expression(knob, dimension):
+            yield dimension, 'python', expr
+        else:
+            yield dimension, 'tcl', expr
+
+
+def expression_knobs(scripter, nodes=None):
+    for node in nodes if nodes is not None else all_nodes():
+        _, _, expressions = scripter.get_py_knobs(node)
+
+        for knob in expressions:
+            for dimension, syntax, expr in expression_dimensions(scripter, knob):
+                yield node, knob, dimension, syntax, expr
@@ -0,0 +1,213 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+
+import nuke  # type: ignore
+
+from ..nuke_util.pyside import (
+    Qt,
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QAbstractItemView,
+)
+
+from .comp_knobs import all_nodes
+from .knob_index import callback_knobs, python_classes
+from .batch import undo_group, suspended_callbacks
+
+
+def symbol_pattern(search):
+    # whole symbols only, replacing 'Blur1' must not touch 'Blur12'
+    start = r'(?<!\w)' if re.match(r'\w', search) else ''
+    end = r'(?!\w)' if re.search(r'\w$', search) else ''
+
+    return re.compile(start + re.escape(search) + end)
+
+
+def knob_codes(scripter, knob):
+    knob_name = knob.name()
+    knob_class = knob.Class()
+
+    if knob_name == 'kernelSource':
+        return [(0, 'blink', scripter.get_blinkscript_source(knob))]
+
+    if knob_class in python_classes:
+        return [(0, 'python', knob.toScript())]
+
+    if knob_name in callback_knobs or knob_class == 'PyScript_Knob':
+        return [(0, 'python', knob.value())]
+
+    if knob.hasExpression():
+        return [(d, e['syntax'], e['value'])
+                for d, e in enumerate(scripter.get_expression(knob)) if e]
+
+    return []
+
+
+def write_code(scripter, knob, dimension, syntax, code):
+    if syntax == 'blink':
+        knob.fromScript(code)
+        knob.node().knob('recompile').execute()
+
+    elif knob.hasExpression(dimension):
+        expr_dimension = -1 if knob.singleValue() else dimension
+        scripter.set_expression(knob, code, syntax, expr_dimension)
+
+    else:
+        knob.setValue(code)
+
+
+def changed_line(before, after):
+    for old, new in zip(before.split('\n'), after.split('\n')):
+        if not old == new:
+            return old.strip(), new.strip()
+
+    return before.strip(), after.strip()
+
+
+def find_hits(scripter, search, replace):
+    pattern = symbol_pattern(search)
+    hits = []
+
+    for node in [nuke.root()] + all_nodes():
+        for knob in node.knobs().values():
+            for dimension, syntax, code in knob_codes(scripter, knob):
+                if not code or not search in code:
+                    continue
+
+                after, count = pattern.subn(lambda _: replace, code)
+                if not count:
+                    continue
+
+                hits.append({
+                    'node': node.fullName(),
+                    'knob': knob.name(),
+                    'dimension': dimension,
+                    'syntax': syntax,
+                    'before': code,
+                    'after': after,
+                    'count': count
+                })
+
+    return hits
+
+
+def find_knob(node_name, knob_name):
+    node = nuke.root() if node_name == 'root' else nuke.toNode(node_name)
+    return node.knob(knob_name) if node else None
+
+
+def apply_hits(scripter, hits, label):
+    applied = []
+    failed = []
+
+    with undo_group(label), suspended_callbacks(scripter):
+        for hit in hits:
+            knob = find_knob(hit['node'], hit['knob'])
+            if not knob:
+                failed.append((hit, 'node or knob does not exist'))
+                continue
+
+            current = [code for d, _, code in knob_codes(scripter, knob)
+                       if d == hit['dimension']]
+
+            if not current or not current[0] == hit['before']:
+                failed.append((hit, 'changed since the preview'))
+                continue
+
+            try:
+                write_code(scripter, knob, hit['dimension'], hit['syntax'], hit['after'])
+                applied.append(hit)
+            except Exception as e:
+                failed.append((hit, str(e)))
+
+    return applied, failed
+
+
+class replace_widget(QWidget):
+    def __init__(self, scripter):
+        QWidget.__init__(self, scripter)
+        self.scripter = scripter
+        self.hits = []
+        self.search = ''
+        self.replace = ''
+
+        self.setWindowFlags(Qt.Tool)
+        self.setWindowTitle('Replace in Comp')
+        self.resize(900, 500)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.info_label = QLabel()
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(
+            ['Node', 'Knob', 'Dimension', 'Count', 'Before', 'After'])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+
+        apply_button = QPushButton('Apply Checked')
+        apply_button.clicked.connect(self.apply)
+
+        cancel_button = QPushButton('Cancel')
+        cancel_button.clicked.connect(self.close)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(apply_button)
+        buttons_layout.addWidget(cancel_button)
+
+        layout.addWidget(self.info_label)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons_layout)
+
+    def set_hits(self, search, replace, hits, elapsed):
+        self.search = search
+        self.replace = replace
+        self.hits = hits
+
+        self.info_label.setText(
+            "'{}' -> '{}' : {} replacements in {} knobs, found in {:.2f}s".format(
+                search, replace, sum(h['count'] for h in hits), len(hits), elapsed))
+
+        self.table.setRowCount(len(hits))
+
+        for row, hit in enumerate(hits):
+            before, after = changed_line(hit['before'], hit['after'])
+
+            values = [hit['node'], hit['knob'], str(hit['dimension']),
+                      str(hit['count']), before, after]
+
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+
+                if column == 0:
+                    item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                    item.setCheckState(Qt.Checked)
+
+                self.table.setItem(row, column, item)
+
+        self.table.resizeColumnsToContents()
+
+    def checked_hits(self):
+        return [hit for row, hit in enumerate(self.hits)
+                if self.table.item(row, 0).checkState() == Qt.Checked]
+
+    def apply(self):
+        hits = self.checked_hits()
+        if not hits:
+            return
+
+        self.close()
+        self.scripter.apply_replace(self.search, self.replace, hits)
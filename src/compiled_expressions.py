@@ -0,0 +1,149 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+import sys
+import json
+import types
+
+import nuke  # type: ignore
+
+from .bounded_cache import bounded_cache, source_hash
+from .expressions import line_count
+
+MODULE_NAME = 'vina_expressions'
+SOURCE_KNOB = 'vina_compiled'
+
+functions = bounded_cache(4096, lru=False)
+call_pattern = re.compile(
+    r"{}'\)\.call\('([^']+)', '([^']+)'\)".format(MODULE_NAME))
+
+
+def source_key(knob, dimension):
+    return '{}.{}'.format(knob.name(), max(dimension, 0))
+
+
+def read_sources(node):
+    # key -> {version: source}, every version that an expression of the node
+    # references is kept, so an undo of only one of the two writes still loads
+    knob = node.knob(SOURCE_KNOB)
+    if not knob:
+        return {}
+
+    sources = json.loads(knob.value() or '{}')
+
+    # scripts saved with a single source per key
+    for key, versions in sources.items():
+        if not isinstance(versions, dict):
+            sources[key] = {source_hash(versions): versions}
+
+    return sources
+
+
+def referenced_versions(node):
+    versions = set()
+
+    for knob in node.knobs().values():
+        if not hasattr(knob, 'animations'):
+            continue
+
+        for curve in knob.animations():
+            for key, version in call_pattern.findall(curve.expression() or ''):
+                versions.add((key, version))
+
+    return versions
+
+
+def write_sources(node, sources):
+    knob = node.knob(SOURCE_KNOB)
+
+    if not knob:
+        knob = nuke.String_Knob(SOURCE_KNOB)
+        knob.setFlag(nuke.INVISIBLE)
+        node.addKnob(knob)
+
+    knob.setValue(json.dumps(sources))
+
+
+def function_source(code):
+    body = code.strip('\n')
+
+    if line_count(body) > 1 or 'ret=' in body or 'ret ' in body:
+        lines = ['    ' + line for line in body.split('\n')]
+        return 'def expression():\n{}\n    return ret\n'.format('\n'.join(lines))
+
+    return 'def expression():\n    return ({})\n'.format(body.strip())
+
+
+def compile_function(code, name):
+    code_object = compile(function_source(code),
+                          '<vina expression {}>'.format(name), 'exec')
+
+    namespace = {}
+    exec(code_object, sys.modules['__main__'].__dict__, namespace)
+
+    return namespace['expression']
+
+
+def load(node, key, version):
+    code = read_sources(node).get(key, {}).get(version)
+
+    if code is None:
+        raise RuntimeError('{}: compiled expression {} not found'.format(
+            node.fullName(), key))
+
+    function = compile_function(code, '{}.{}'.format(node.fullName(), key))
+    functions.set((node.fullName(), key, version), function)
+
+    return function
+
+
+def call(key, version):
+    node = nuke.thisNode()
+    function = functions.get((node.fullName(), key, version))
+
+    if not function:
+        function = load(node, key, version)
+
+    return function()
+
+
+def register(node, knob, dimension, code):
+    key = source_key(knob, dimension)
+    version = source_hash(code)
+
+    function = compile_function(code, '{}.{}'.format(node.fullName(), key))
+    functions.set((node.fullName(), key, version), function)
+
+    # the expression is written after the sources, the version it replaces
+    # is still referenced here and is pruned by the next register
+    referenced = referenced_versions(node)
+    sources = {}
+
+    for name, versions in read_sources(node).items():
+        kept = {v: c for v, c in versions.items() if (name, v) in referenced}
+        if kept:
+            sources[name] = kept
+
+    sources.setdefault(key, {})[version] = code
+    write_sources(node, sources)
+
+    return "[python {{__import__('{}').call('{}', '{}')}}]".format(
+        MODULE_NAME, key, version)
+
+
+def get_source(node, raw_expression):
+    match = call_pattern.search(raw_expression or '')
+    if not match:
+        return None
+
+    key, version = match.groups()
+    return read_sources(node).get(key, {}).get(version)
+
+
+if not MODULE_NAME in sys.modules:
+    module = types.ModuleType(MODULE_NAME)
+    module.call = call
+    sys.modules[MODULE_NAME] = module
@@ -6,6 +6,7 @@
 import nuke # type: ignore
 
 import re
+from textwrap import dedent
 
 from ..nuke_util.pyside import (
     Qt,
@@ -115,6 +116,33 @@ class multi_editor_widget(QWidget):
     def get_code(self, dimension=0):
         return self.editors[dimension].get_code()
 
+    def get_selection(self, dimension=0):
+        # the complete lines of the selection and the number of the first one
+        cursor = self.editors[dimension].editor.textCursor()
+
+        if not cursor.hasSelection():
+            return '', 0
+
+        document = cursor.document()
+        block = document.findBlock(cursor.selectionStart())
+        last = document.findBlock(cursor.selectionEnd())
+
+        # a selection ending at the start of a line does not include it
+        if last.position() == cursor.selectionEnd() and not last == block:
+            last = last.previous()
+        first_line = block.blockNumber()
+
+        lines = []
+        while block.isValid():
+            lines.append(block.text())
+
+            if block == last:
+                break
+
+            block = block.next()
+
+        return dedent('\n'.join(lines)), first_line
+
     def set_focus(self, dimension=-1):
         if dimension == -1:
             dimension = self.focus_dimension
@@ -127,6 +155,9 @@ class multi_editor_widget(QWidget):
     def set_line_error(self, line_number, dimension=0):
         self.editors[dimension].set_line_error(line_number)
 
+    def set_line_times(self, line_times, dimension=0):
+        self.editors[dimension].editor.set_line_times(line_times)
+
 
 class editor_widget(QWidget):
     def __init__(self, parent, index=0):
@@ -174,6 +205,7 @@ class editor_widget(QWidget):
 
         if not code == self.get_code():
             self.connect_changed(False)
+            self.editor.set_line_times({})
             self.editor.setPlainText(code)
             self.set_syntax(syntax)
 
@@ -261,6 +293,9 @@ class code_editor(QPlainTextEdit):
 
         self.blockCountChanged.connect(self.number_area.update)
 
+        # the timings belong to lines, they are dropped when lines move
+        self.blockCountChanged.connect(lambda _: self.set_line_times({}))
+
         self.setViewportMargins(self.number_area_width + 2, 0, 0, 0)
 
         self.highlight_line_selection = None
@@ -309,6 +344,7 @@ class code_editor(QPlainTextEdit):
         self.parent.connect_changed()
 
         ctrl = event.modifiers() == Qt.ControlModifier
+        ctrl_shift = event.modifiers() == Qt.ControlModifier | Qt.ShiftModifier
         key = event.key()
 
         if key == Qt.Key_Escape:
@@ -318,6 +354,10 @@ class code_editor(QPlainTextEdit):
             self.parent.parent.parent.execute_script()
             return
 
+        elif ctrl_shift and key == Qt.Key_Return:
+            self.parent.parent.parent.execute_cell()
+            return
+
         elif ctrl and key == Qt.Key_Backspace:
             self.parent.parent.parent.clean_output_console()
             return
@@ -328,10 +368,23 @@ class code_editor(QPlainTextEdit):
         else:
             return normal_key_press_event(self, event)
 
+    def set_line_times(self, line_times):
+        if not line_times and not self.number_area.line_times:
+            return
+
+        self.number_area.set_line_times(line_times)
+        width = self.number_area_width + self.number_area.times_width()
+
+        self.setViewportMargins(width + 2, 0, 0, 0)
+
+        cr = self.contentsRect()
+        self.number_area.setGeometry(QRect(cr.left(), cr.top(), width, cr.height()))
+
     def resizeEvent(self, e):
         super(code_editor, self).resizeEvent(e)
         cr = self.contentsRect()
-        rect = QRect(cr.left(), cr.top(), self.number_area_width, cr.height())
+        width = self.number_area_width + self.number_area.times_width()
+        rect = QRect(cr.left(), cr.top(), width, cr.height())
         self.number_area.setGeometry(rect)
 
     def set_mode(self, mode):
@@ -468,10 +521,48 @@ class line_number_area(QWidget):
 
         self.vim_mode = False
 
+        self.line_times = {}
+        self.max_time = 0.0
+        self.slowest_lines = []
+        self.times_text_color = QColor(140, 140, 140)
+        self.slow_text_color = QColor(255, 120, 90)
+        self.heat_color = QColor(200, 60, 40)
+
     def set_vim_mode(self, vim_mode):
         self.vim_mode = vim_mode
         self.update()
 
+    def set_line_times(self, line_times):
+        # {line number: (seconds, hits)} of the last line profile run
+        self.line_times = line_times
+        self.max_time = max([t for t, _ in line_times.values()] or [0.0])
+
+        ranked = sorted(line_times, key=lambda l: line_times[l][0], reverse=True)
+        self.slowest_lines = ranked[:3]
+
+        self.update()
+
+    def times_width(self):
+        return 110 if self.line_times else 0
+
+    def draw_line_time(self, painter, line, top, height):
+        seconds, hits = self.line_times[line]
+        width = self.times_width()
+
+        if self.max_time:
+            heat = QColor(self.heat_color)
+            heat.setAlpha(int(30 + 200 * seconds / self.max_time))
+            bar = int((width - 4) * seconds / self.max_time)
+            painter.fillRect(2, int(top) + 1, max(bar, 1), height - 2, heat)
+
+        if line in self.slowest_lines:
+            painter.setPen(self.slow_text_color)
+        else:
+            painter.setPen(self.times_text_color)
+
+        text = '{:.1f}ms x{}'.format(seconds * 1000, hits)
+        painter.drawText(4, top, width - 8, height, Qt.AlignLeft, text)
+
     def set_color(self, color):
         self.current_text_color = color
         self.update()
@@ -503,11 +594,13 @@ class line_number_area(QWidget):
                     if self.vim_mode:
                         number = str(abs(current_number - block_number))
 
-                painter.setPen(color)
-
                 width = self.width()
                 height = self.editor.fontMetrics().height()
 
+                if block_number + 1 in self.line_times:
+                    self.draw_line_time(painter, block_number + 1, top, height)
+
+                painter.setPen(color)
                 painter.drawText(-5, top, width, height, Qt.AlignRight, number)
 
             block = block.next()
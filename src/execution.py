@@ -0,0 +1,116 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import sys
+import types
+import linecache
+import traceback
+from itertools import count
+
+import nuke  # type: ignore
+
+from .bounded_cache import bounded_cache, source_hash
+
+MODULE_NAME = 'vina_execution'
+PSEUDO_DIR = 'vina_scripter/'
+
+code_objects = bounded_cache(256)
+pending = {}
+run_ids = count()
+
+
+def pseudo_path(name):
+    return '{}{}.py'.format(PSEUDO_DIR, name.replace(' ', '_'))
+
+
+def compile_code(code, filename, first_line=0):
+    # the blank lines keep the line numbers of a cell or selection
+    # equal to the lines of the page
+    source = '\n' * first_line + code
+    key = (filename, source_hash(source))
+
+    code_object = code_objects.get(key)
+
+    if code_object is None:
+        code_object = compile(source, filename, 'exec')
+        code_objects.set(key, code_object)
+
+    # traceback reads the source lines of the pseudo file from linecache,
+    # entries without mtime are never invalidated by checkcache
+    linecache.cache[filename] = (
+        len(source), None, source.splitlines(True), filename)
+
+    return code_object
+
+
+def run(run_id):
+    code_object, globals_dict, profiler = pending[run_id]
+
+    if globals_dict is None:
+        globals_dict = sys.modules['__main__'].__dict__
+
+    if not profiler:
+        exec(code_object, globals_dict)
+        return
+
+    profiler.enable()
+
+    try:
+        exec(code_object, globals_dict)
+    finally:
+        profiler.disable()
+
+
+def execute(context, code_object, globals_dict=None, profiler=None):
+    # nuke.runIn only takes source code, it runs a call back to this
+    # module which executes the code object inside the context
+    run_id = next(run_ids)
+    pending[run_id] = (code_object, globals_dict, profiler)
+
+    try:
+        nuke.runIn(context, "__import__('{}').run({})".format(MODULE_NAME, run_id))
+    finally:
+        pending.pop(run_id, None)
+
+
+def error_line(filename):
+    _, error, tb = sys.exc_info()
+
+    if isinstance(error, SyntaxError) and error.filename == filename:
+        return error.lineno
+
+    line = None
+
+    for frame_file, line_number, _, _ in traceback.extract_tb(tb):
+        if frame_file == filename:
+            line = line_number
+
+    return line
+
+
+def format_error(filename):
+    error_type, error, tb = sys.exc_info()
+    frames = traceback.extract_tb(tb)
+
+    # the frames of the scripter and the trampoline are not shown
+    for i, frame in enumerate(frames):
+        if frame[0] == filename:
+            frames = frames[i:]
+            break
+
+    lines = ['Traceback (most recent call last):\n']
+
+    if not isinstance(error, SyntaxError):
+        lines += traceback.format_list(frames)
+
+    lines += traceback.format_exception_only(error_type, error)
+
+    return ''.join(lines)
+
+
+if not MODULE_NAME in sys.modules:
+    module = types.ModuleType(MODULE_NAME)
+    module.run = run
+    sys.modules[MODULE_NAME] = module
@@ -0,0 +1,65 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import json
+
+import nuke  # type: ignore
+
+from .expression_range import is_finite
+
+
+def source_knob_name(knob):
+    return 'vina_baked_{}'.format(knob.name())
+
+
+def store_source(node, knob, raw_exprs):
+    name = source_knob_name(knob)
+    source_knob = node.knob(name)
+
+    if not source_knob:
+        source_knob = nuke.String_Knob(name)
+        source_knob.setFlag(nuke.INVISIBLE)
+        node.addKnob(source_knob)
+
+    sources = {str(d): expr for d, expr in enumerate(raw_exprs) if expr}
+    source_knob.setValue(json.dumps(sources))
+
+
+def bake_values(knob, dimension, first, values):
+    keys = [nuke.AnimationKey(first + i, v)
+            for i, v in enumerate(values) if is_finite(v)]
+
+    knob.clearAnimated(dimension)
+    knob.setAnimated(dimension)
+
+    # setAnimated leaves a key at the current frame, it is removed
+    # when that frame is outside the range or its value was skipped
+    curve = knob.animation(dimension)
+    curve.addKey(keys)
+
+    baked_frames = set(key.x for key in keys)
+    stray = [key for key in curve.keys() if not key.x in baked_frames]
+
+    if stray:
+        curve.removeKey(stray)
+
+    return len(values) - len(keys)
+
+
+def unbake(node, knob):
+    source_knob = node.knob(source_knob_name(knob))
+    if not source_knob:
+        return False
+
+    sources = json.loads(source_knob.value() or '{}')
+
+    for dimension, expr in sources.items():
+        dimension = int(dimension)
+
+        knob.clearAnimated(dimension)
+        knob.setExpression(expr, dimension)
+
+    node.removeKnob(source_knob)
+    return True
@@ -0,0 +1,212 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+import ast
+
+from .expressions import line_count, evaluate
+from .timing import timer
+
+math_functions = {
+    'sin': 'sin', 'cos': 'cos', 'tan': 'tan',
+    'asin': 'asin', 'acos': 'acos', 'atan': 'atan', 'atan2': 'atan2',
+    'sinh': 'sinh', 'cosh': 'cosh', 'tanh': 'tanh',
+    'exp': 'exp', 'log10': 'log10', 'sqrt': 'sqrt', 'pow': 'pow',
+    'floor': 'floor', 'ceil': 'ceil', 'fabs': 'fabs', 'hypot': 'hypot',
+    'degrees': 'degrees', 'radians': 'radians', 'fmod': 'fmod'
+}
+
+builtin_functions = {'abs': 'abs', 'min': 'min', 'max': 'max'}
+
+binary_operators = {
+    ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/'
+}
+
+compare_operators = {
+    ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=',
+    ast.Eq: '==', ast.NotEq: '!='
+}
+
+identifier = re.compile(r'^[A-Za-z_]\w*$')
+
+
+class not_translatable(Exception):
+    pass
+
+
+def number_value(node):
+    constant = getattr(ast, 'Constant', None)
+
+    if constant:
+        if not isinstance(node, constant):
+            return None
+        value = node.value
+
+    elif isinstance(node, ast.Num):
+        value = node.n
+    else:
+        return None
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+
+    return value
+
+
+def string_value(node):
+    constant = getattr(ast, 'Constant', None)
+
+    if constant:
+        if not isinstance(node, constant):
+            return None
+        value = node.value
+
+    elif isinstance(node, ast.Str):
+        value = node.s
+    else:
+        return None
+
+    return value if isinstance(value, str) else None
+
+
+def is_name(node, name):
+    return isinstance(node, ast.Name) and node.id == name
+
+
+def is_call(node, module, function):
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and is_name(node.func.value, module) and node.func.attr == function)
+
+
+def knob_reference(node):
+    # nuke.thisNode()['knob'].value(), nuke.toNode('Node').knob('knob').getValue()
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+        return None
+
+    if not node.func.attr in ['value', 'getValue'] or node.args:
+        return None
+
+    knob = node.func.value
+
+    if isinstance(knob, ast.Subscript):
+        owner = knob.value
+        key = knob.slice
+        if isinstance(key, getattr(ast, 'Index', ())):
+            key = key.value
+
+        knob_name = string_value(key)
+
+    elif (isinstance(knob, ast.Call) and isinstance(knob.func, ast.Attribute)
+          and knob.func.attr == 'knob' and len(knob.args) == 1):
+        owner = knob.func.value
+        knob_name = string_value(knob.args[0])
+
+    else:
+        return None
+
+    if not knob_name or not identifier.match(knob_name):
+        return None
+
+    # a bare name would read x, y, t, frame or pi as the tcl variables,
+    # not as the knob
+    if is_call(owner, 'nuke', 'thisNode') and not owner.args:
+        return 'this.{}'.format(knob_name)
+
+    if is_call(owner, 'nuke', 'toNode') and len(owner.args) == 1:
+        node_name = string_value(owner.args[0])
+
+        if node_name and identifier.match(node_name):
+            return '{}.{}'.format(node_name, knob_name)
+
+    return None
+
+
+def to_tcl(node):
+    number = number_value(node)
+    if number is not None:
+        return repr(number)
+
+    if isinstance(node, ast.Expression):
+        return to_tcl(node.body)
+
+    if isinstance(node, ast.BinOp):
+        left, right = to_tcl(node.left), to_tcl(node.right)
+
+        if isinstance(node.op, ast.Pow):
+            return 'pow({}, {})'.format(left, right)
+
+        if type(node.op) in binary_operators:
+            return '({} {} {})'.format(
+                left, binary_operators[type(node.op)], right)
+
+    if isinstance(node, ast.UnaryOp):
+        if isinstance(node.op, ast.USub):
+            return '(-{})'.format(to_tcl(node.operand))
+
+        if isinstance(node.op, ast.UAdd):
+            return to_tcl(node.operand)
+
+    if isinstance(node, ast.Compare) and len(node.ops) == 1:
+        if type(node.ops[0]) in compare_operators:
+            return '({} {} {})'.format(
+                to_tcl(node.left), compare_operators[type(node.ops[0])],
+                to_tcl(node.comparators[0]))
+
+    if isinstance(node, ast.IfExp):
+        return '({} ? {} : {})'.format(
+            to_tcl(node.test), to_tcl(node.body), to_tcl(node.orelse))
+
+    if isinstance(node, ast.Attribute) and is_name(node.value, 'math'):
+        if node.attr == 'pi':
+            return 'pi'
+
+    if isinstance(node, ast.Call) and not getattr(node, 'keywords', None):
+        if is_call(node, 'nuke', 'frame') and not node.args:
+            return 'frame'
+
+        knob = knob_reference(node)
+        if knob:
+            return knob
+
+        func = node.func
+        name = None
+
+        if isinstance(func, ast.Attribute) and is_name(func.value, 'math'):
+            name = math_functions.get(func.attr)
+
+        elif isinstance(func, ast.Name):
+            name = builtin_functions.get(func.id)
+
+        if name and node.args:
+            if name in ['min', 'max'] and not len(node.args) == 2:
+                raise not_translatable(ast.dump(node))
+
+            args = ', '.join(to_tcl(arg) for arg in node.args)
+            return '{}({})'.format(name, args)
+
+    raise not_translatable(node.__class__.__name__)
+
+
+def python_to_tcl(code):
+    code = code.strip()
+
+    if not code or line_count(code) > 1 or 'ret=' in code or 'ret ' in code:
+        return None
+
+    try:
+        tree = ast.parse(code, mode='eval')
+        return to_tcl(tree)
+    except (SyntaxError, not_translatable):
+        return None
+
+
+def measure(node, knob, code, syntax, repeat=20):
+    result = evaluate(node, knob, code, syntax)
+    start = timer()
+
+    for _ in range(repeat):
+        evaluate(node, knob, code, syntax)
+
+    return result, (timer() - start) / repeat
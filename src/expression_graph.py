@@ -0,0 +1,340 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+import time
+
+import nuke  # type: ignore
+
+from .comp_knobs import all_nodes, expression_dimensions
+
+tcl_reference = re.compile(
+    r'(?<![\w\.$])([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)\s*(\()?')
+
+python_reference = re.compile(
+    r'''(?:toNode\(\s*['"]([\w\.]+)['"]\s*\)|(thisNode)\(\s*\))\s*'''
+    r'''(?:\[\s*['"](\w+)['"]\s*\]|\.knob\(\s*['"](\w+)['"]\s*\))''')
+
+MAX_MEMBERS = 10
+
+tcl_words = set(['frame', 'x', 'y', 't', 'pi', 'python', 'value', 'expr',
+                 'return', 'set', 'knob', 'if', 'else'])
+
+
+def shorten(members):
+    if len(members) <= MAX_MEMBERS:
+        return members
+
+    half = MAX_MEMBERS // 2
+    skipped = '... {} more ...'.format(len(members) - 2 * half)
+
+    return members[:half] + [skipped] + members[-half:]
+
+
+def split_id(knob_id):
+    return knob_id.rsplit('.', 1)
+
+
+def group_prefix(node_name):
+    return node_name.rsplit('.', 1)[0] + '.' if '.' in node_name else ''
+
+
+class expression_graph(object):
+    def __init__(self):
+        self.scripter = None
+        self.clear()
+
+    def clear(self):
+        self.deps = {}
+        self.users = {}
+        self.node_knobs = {}
+        self.built = False
+
+    def node_exists(self, name):
+        return not nuke.toNode(name) is None
+
+    def resolve(self, node, parts, exists):
+        name = node.fullName()
+        prefix = group_prefix(name)
+
+        if parts[0] == 'this' and len(parts) > 1:
+            return '{}.{}'.format(name, parts[1])
+
+        if parts[0] == 'parent' and len(parts) > 1:
+            group = prefix[:-1] if prefix else 'root'
+            return '{}.{}'.format(group, parts[1])
+
+        if parts[0] == 'root' and len(parts) > 1:
+            return 'root.{}'.format(parts[1])
+
+        if node.knob(parts[0]):
+            return '{}.{}'.format(name, parts[0])
+
+        if len(parts) > 1 and exists(prefix + parts[0]):
+            return '{}{}.{}'.format(prefix, parts[0], parts[1])
+
+        return None
+
+    def references(self, node, syntax, expr, exists):
+        refs = set()
+
+        if syntax == 'python':
+            prefix = group_prefix(node.fullName())
+
+            for to_node, this_node, key, knob_call in python_reference.findall(expr):
+                knob_name = key or knob_call
+                if this_node:
+                    refs.add('{}.{}'.format(node.fullName(), knob_name))
+                elif exists(prefix + to_node):
+                    refs.add('{}{}.{}'.format(prefix, to_node, knob_name))
+
+            return refs
+
+        for identifier, call in tcl_reference.findall(expr):
+            parts = identifier.split('.')
+
+            if len(parts) == 1 and (call or identifier in tcl_words):
+                continue
+
+            ref = self.resolve(node, parts, exists)
+            if ref:
+                refs.add(ref)
+
+        return refs
+
+    def set_dependencies(self, knob_id, refs):
+        for ref in self.deps.pop(knob_id, ()):
+            users = self.users.get(ref)
+            if users:
+                users.discard(knob_id)
+
+        node_name = split_id(knob_id)[0]
+
+        if not refs:
+            knobs = self.node_knobs.get(node_name)
+            if knobs:
+                knobs.discard(knob_id)
+            return
+
+        self.deps[knob_id] = refs
+        self.node_knobs.setdefault(node_name, set()).add(knob_id)
+
+        for ref in refs:
+            self.users.setdefault(ref, set()).add(knob_id)
+
+    def update_knob(self, node, knob, exists=None):
+        exists = exists or self.node_exists
+        refs = set()
+
+        for _, syntax, expr in expression_dimensions(self.scripter, knob):
+            refs |= self.references(node, syntax, expr, exists)
+
+        knob_id = '{}.{}'.format(node.fullName(), knob.name())
+        refs.discard(knob_id)
+
+        if refs or knob_id in self.deps:
+            self.set_dependencies(knob_id, refs)
+
+    def update_node(self, node, exists=None):
+        _, _, expressions = self.scripter.get_py_knobs(node)
+
+        for knob in expressions:
+            self.update_knob(node, knob, exists)
+
+    def remove_node(self, node_name):
+        for knob_id in list(self.node_knobs.pop(node_name, ())):
+            self.set_dependencies(knob_id, set())
+
+    def build(self, scripter):
+        self.clear()
+        self.scripter = scripter
+
+        nodes = all_nodes()
+        names = set(node.fullName() for node in nodes)
+        names.add('root')
+
+        for node in nodes:
+            self.update_node(node, names.__contains__)
+
+        self.built = True
+
+    def knob_changed(self):
+        if not self.built:
+            return
+
+        node = nuke.thisNode()
+        knob = nuke.thisKnob()
+
+        if knob.name() == 'name':
+            for name in [n for n in self.node_knobs if not self.node_exists(n)]:
+                self.remove_node(name)
+
+            self.update_node(node)
+
+        elif knob.hasExpression() or '{}.{}'.format(node.fullName(), knob.name()) in self.deps:
+            self.update_knob(node, knob)
+
+    def node_created(self):
+        if self.built:
+            self.update_node(nuke.thisNode())
+
+    def node_destroyed(self):
+        if self.built:
+            self.remove_node(nuke.thisNode().fullName())
+
+    def strongly_connected(self):
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        components = []
+        counter = 0
+
+        for root in list(self.deps):
+            if root in index:
+                continue
+
+            work = [(root, iter(self.deps.get(root, ())))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                knob_id, children = work[-1]
+                advanced = False
+
+                for child in children:
+                    if not child in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.deps.get(child, ()))))
+                        advanced = True
+                        break
+
+                    if child in on_stack:
+                        low[knob_id] = min(low[knob_id], index[child])
+
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[knob_id])
+
+                if low[knob_id] == index[knob_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == knob_id:
+                            break
+
+                    components.append(component)
+
+        return components
+
+    def analyze(self):
+        components = self.strongly_connected()
+        component_of = {}
+
+        for i, component in enumerate(components):
+            for knob_id in component:
+                component_of[knob_id] = i
+
+        cycles = [c for c in components if len(c) > 1]
+
+        # Tarjan emits components in reverse topological order, so every
+        # dependency component has its depth before the ones using it.
+        depth = [0] * len(components)
+        following = [None] * len(components)
+        end = [0] * len(components)
+
+        for i, component in enumerate(components):
+            best = 0
+            for knob_id in component:
+                for ref in self.deps.get(knob_id, ()):
+                    j = component_of.get(ref)
+                    if j is None or j == i:
+                        continue
+
+                    if depth[j] > best:
+                        best = depth[j]
+                        following[i] = j
+
+            depth[i] = best + 1
+            end[i] = i if following[i] is None else end[following[i]]
+
+        def chain(i):
+            members = []
+            while i is not None:
+                members.append(components[i][0])
+                i = following[i]
+            return members
+
+        deepest = sorted(range(len(components)),
+                         key=lambda i: depth[i], reverse=True)
+        chains = []
+        used = set()
+
+        # only one chain per last component, the chains kept are the only
+        # ones walked, so a long linear chain is not walked once per member
+        for i in deepest:
+            if depth[i] < 2 or len(chains) == 5:
+                break
+
+            if end[i] in used:
+                continue
+
+            used.add(end[i])
+            chains.append(chain(i))
+
+        fan_in = sorted(self.users.items(), key=lambda u: len(u[1]), reverse=True)
+        fan_in = [(knob_id, len(users)) for knob_id, users in fan_in[:10] if users]
+
+        return cycles, chains, fan_in
+
+    def report(self):
+        cycles, chains, fan_in = self.analyze()
+        references = sum(len(refs) for refs in self.deps.values())
+
+        lines = ['expression graph: {} knobs with references, {} references'.format(
+            len(self.deps), references)]
+
+        lines.append('cycles: {}'.format(len(cycles)))
+        for cycle in cycles[:10]:
+            lines.append('    {}: {}'.format(len(cycle), ', '.join(shorten(sorted(cycle)))))
+
+        lines.append('deepest chains:')
+        for members in chains:
+            lines.append('    {}: {}'.format(len(members), ' -> '.join(shorten(members))))
+
+        lines.append('highest fan-in:')
+        for knob_id, count in fan_in:
+            lines.append('    {} : {}'.format(knob_id, count))
+
+        return '\n'.join(lines)
+
+
+graph = expression_graph()
+
+
+def show_dependencies(scripter, rebuild=False):
+    if not graph.built or rebuild:
+        start = time.time()
+
+        if not graph.scripter:
+            nuke.addKnobChanged(graph.knob_changed)
+            nuke.addOnCreate(graph.node_created)
+            nuke.addOnDestroy(graph.node_destroyed)
+
+        graph.build(scripter)
+        print('expression graph built in {:.2f}s'.format(time.time() - start))
+
+    print(graph.report())
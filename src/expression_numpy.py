@@ -0,0 +1,299 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .timing import timer
+
+token_pattern = re.compile(r'''
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?) |
+        (?P<name>[A-Za-z_][\w\.]*) |
+        (?P<op>&&|\|\||<=|>=|==|!=|[-+*/%()<>,?:!])
+    )''', re.VERBOSE)
+
+binary_precedence = [
+    ['||'], ['&&'], ['==', '!='], ['<', '<=', '>', '>='],
+    ['+', '-'], ['*', '/', '%']
+]
+
+variables = ['frame', 't', 'x']
+
+
+class unsupported(Exception):
+    pass
+
+
+def tokenize(code):
+    tokens = []
+    pos = 0
+    code = code.strip()
+
+    while pos < len(code):
+        match = token_pattern.match(code, pos)
+        if not match or match.end() == pos:
+            raise unsupported(code[pos:])
+
+        pos = match.end()
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+
+    return tokens
+
+
+class parser(object):
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+
+        if value and not token[1] == value:
+            raise unsupported('expected {}'.format(value))
+
+        self.pos += 1
+        return token
+
+    def parse(self):
+        tree = self.ternary()
+
+        if self.pos < len(self.tokens):
+            raise unsupported(self.peek()[1])
+
+        return tree
+
+    def ternary(self):
+        test = self.binary(0)
+
+        if not self.peek()[1] == '?':
+            return test
+
+        self.take('?')
+        body = self.ternary()
+        self.take(':')
+        orelse = self.ternary()
+
+        return ('if', test, body, orelse)
+
+    def binary(self, level):
+        if level == len(binary_precedence):
+            return self.unary()
+
+        left = self.binary(level + 1)
+
+        while self.peek()[0] == 'op' and self.peek()[1] in binary_precedence[level]:
+            op = self.take()[1]
+            left = ('op', op, left, self.binary(level + 1))
+
+        return left
+
+    def unary(self):
+        kind, value = self.peek()
+
+        if kind == 'op' and value in ['-', '+', '!']:
+            self.take()
+            return ('unary', value, self.unary())
+
+        return self.atom()
+
+    def atom(self):
+        kind, value = self.take()
+
+        if kind == 'number':
+            return ('number', float(value))
+
+        if kind == 'op' and value == '(':
+            tree = self.ternary()
+            self.take(')')
+            return tree
+
+        if kind == 'name':
+            if self.peek()[1] == '(':
+                self.take('(')
+                args = []
+
+                # the arguments are separated by commas, anything else
+                # after an argument is left to Nuke to report
+                if not self.peek()[1] == ')':
+                    args.append(self.ternary())
+
+                    while self.peek()[1] == ',':
+                        self.take(',')
+                        args.append(self.ternary())
+
+                self.take(')')
+
+                if not value in functions:
+                    raise unsupported(value)
+
+                return ('call', value, args)
+
+            if value in variables:
+                return ('frame',)
+
+            if value in constants:
+                return ('number', constants[value])
+
+        raise unsupported(value)
+
+
+def clamp(value, low=0.0, high=1.0):
+    return numpy.clip(value, low, high)
+
+
+def lerp(a, b, x):
+    return a + (b - a) * x
+
+
+def smoothstep(a, b, x):
+    t = numpy.clip((x - a) / (b - a), 0.0, 1.0)
+    return t * t * (3.0 - 2.0 * t)
+
+
+def step(a, x):
+    return numpy.where(x < a, 0.0, 1.0)
+
+
+def reduce_args(function):
+    return lambda *args: reduce_values(function, args)
+
+
+def reduce_values(function, args):
+    result = args[0]
+    for arg in args[1:]:
+        result = function(result, arg)
+    return result
+
+
+constants = {'pi': 3.141592653589793}
+
+functions = {
+    'abs': lambda x: numpy.abs(x),
+    'fabs': lambda x: numpy.abs(x),
+    'acos': lambda x: numpy.arccos(x),
+    'asin': lambda x: numpy.arcsin(x),
+    'atan': lambda x: numpy.arctan(x),
+    'atan2': lambda y, x: numpy.arctan2(y, x),
+    'ceil': lambda x: numpy.ceil(x),
+    'clamp': clamp,
+    'cos': lambda x: numpy.cos(x),
+    'cosh': lambda x: numpy.cosh(x),
+    'degrees': lambda x: numpy.degrees(x),
+    'exp': lambda x: numpy.exp(x),
+    'floor': lambda x: numpy.floor(x),
+    'fmod': lambda x, y: numpy.fmod(x, y),
+    'hypot': lambda x, y: numpy.hypot(x, y),
+    'int': lambda x: numpy.trunc(x),
+    'trunc': lambda x: numpy.trunc(x),
+    'lerp': lerp,
+    'mix': lerp,
+    'log': lambda x: numpy.log(x),
+    'log10': lambda x: numpy.log10(x),
+    'max': reduce_args(lambda a, b: numpy.maximum(a, b)),
+    'min': reduce_args(lambda a, b: numpy.minimum(a, b)),
+    'pow': lambda x, y: numpy.power(x, y),
+    'pow2': lambda x: numpy.power(2.0, x),
+    'radians': lambda x: numpy.radians(x),
+    'rint': lambda x: numpy.rint(x),
+    'sin': lambda x: numpy.sin(x),
+    'sinh': lambda x: numpy.sinh(x),
+    'smoothstep': smoothstep,
+    'sqrt': lambda x: numpy.sqrt(x),
+    'step': step,
+    'tan': lambda x: numpy.tan(x),
+    'tanh': lambda x: numpy.tanh(x)
+}
+
+operators = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': lambda a, b: a / b,
+    '%': lambda a, b: numpy.fmod(a, b),
+    '<': lambda a, b: (a < b) * 1.0,
+    '<=': lambda a, b: (a <= b) * 1.0,
+    '>': lambda a, b: (a > b) * 1.0,
+    '>=': lambda a, b: (a >= b) * 1.0,
+    '==': lambda a, b: (a == b) * 1.0,
+    '!=': lambda a, b: (a != b) * 1.0,
+    '&&': lambda a, b: numpy.logical_and(a, b) * 1.0,
+    '||': lambda a, b: numpy.logical_or(a, b) * 1.0,
+}
+
+
+def compile_expression(code):
+    if not numpy:
+        return None
+
+    try:
+        return parser(tokenize(code)).parse()
+    except unsupported:
+        return None
+
+
+def evaluate_tree(tree, frames):
+    kind = tree[0]
+
+    if kind == 'number':
+        return tree[1]
+
+    if kind == 'frame':
+        return frames
+
+    if kind == 'unary':
+        value = evaluate_tree(tree[2], frames)
+
+        if tree[1] == '-':
+            return -value
+        if tree[1] == '!':
+            return numpy.logical_not(value) * 1.0
+
+        return value
+
+    if kind == 'op':
+        return operators[tree[1]](
+            evaluate_tree(tree[2], frames), evaluate_tree(tree[3], frames))
+
+    if kind == 'if':
+        return numpy.where(evaluate_tree(tree[1], frames),
+                           evaluate_tree(tree[2], frames),
+                           evaluate_tree(tree[3], frames))
+
+    args = [evaluate_tree(arg, frames) for arg in tree[2]]
+    return functions[tree[1]](*args)
+
+
+def evaluate_vectorized(code, first, last):
+    tree = compile_expression(code)
+    if not tree:
+        return None
+
+    start = timer()
+    frames = numpy.arange(first, last + 1, dtype=numpy.float64)
+
+    with numpy.errstate(all='ignore'):
+        try:
+            values = evaluate_tree(tree, frames)
+        except (TypeError, ZeroDivisionError):
+            return None
+
+    values = numpy.broadcast_to(
+        numpy.asarray(values, dtype=numpy.float64), frames.shape)
+
+    elapsed = timer() - start
+
+    return array('d', values.tolist()), array('d', [elapsed / len(frames)])
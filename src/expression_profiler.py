@@ -0,0 +1,132 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import nuke  # type: ignore
+
+from ..nuke_util.pyside import (
+    Qt,
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QAbstractItemView,
+)
+
+from .comp_knobs import expression_knobs
+from .timing import timer
+
+
+def sample_frames(samples):
+    root = nuke.root()
+    first, last = int(root.firstFrame()), int(root.lastFrame())
+
+    if samples <= 1 or first == last:
+        return [first]
+
+    step = (last - first) / float(samples - 1)
+    return sorted(set(int(round(first + i * step)) for i in range(samples)))
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = int(round((len(ordered) - 1) * percent / 100.0))
+
+    return ordered[index]
+
+
+def profile_knob(knob, dimension, frames):
+    times = []
+
+    for frame in frames:
+        start = timer()
+        knob.getValueAt(frame, dimension)
+        times.append(timer() - start)
+
+    return sum(times) / len(times), percentile(times, 95)
+
+
+def profile_comp(scripter, samples=10):
+    frames = sample_frames(samples)
+    results = []
+
+    for node, knob, dimension, syntax, _ in expression_knobs(scripter):
+        try:
+            mean, p95 = profile_knob(knob, dimension, frames)
+        except Exception:
+            continue
+
+        results.append({
+            'node': node.fullName(),
+            'knob': knob.name(),
+            'dimension': dimension,
+            'syntax': syntax,
+            'mean': mean,
+            'p95': p95
+        })
+
+    results.sort(key=lambda r: r['mean'], reverse=True)
+    return results, frames
+
+
+class profiler_widget(QWidget):
+    def __init__(self, scripter):
+        QWidget.__init__(self, scripter)
+        self.scripter = scripter
+        self.results = []
+
+        self.setWindowFlags(Qt.Tool)
+        self.setWindowTitle('Expression Profiler')
+        self.resize(700, 500)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.info_label = QLabel()
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(
+            ['Node', 'Knob', 'Dimension', 'Syntax', 'Mean ms', 'P95 ms'])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.cellDoubleClicked.connect(self.enter_row)
+
+        layout.addWidget(self.info_label)
+        layout.addWidget(self.table)
+
+    def set_results(self, results, frames, elapsed):
+        self.results = results
+        self.info_label.setText(
+            '{} expressions, {} sample frames, profiled in {:.2f}s'
+            ' ( double click to edit )'.format(len(results), len(frames), elapsed))
+
+        self.table.setRowCount(len(results))
+
+        for row, result in enumerate(results):
+            values = [
+                result['node'], result['knob'], str(result['dimension']),
+                result['syntax'], '{:.4f}'.format(result['mean'] * 1000),
+                '{:.4f}'.format(result['p95'] * 1000)]
+
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+
+        self.table.resizeColumnsToContents()
+
+    def enter_row(self, row, _=0):
+        result = self.results[row]
+
+        node = nuke.toNode(result['node'])
+        if not node:
+            return
+
+        knob = node.knob(result['knob'])
+        if not knob:
+            return
+
+        dimension = -1 if knob.singleValue() else result['dimension']
+        self.scripter.enter(node, knob, result['syntax'], dimension)
@@ -0,0 +1,97 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+import math
+from array import array
+
+import nuke  # type: ignore
+
+from .timing import timer
+
+
+def parse_frame_range(text=''):
+    numbers = re.findall(r'(?<!\d)-?\d+', text or '')
+
+    if len(numbers) >= 2:
+        first, last = int(numbers[0]), int(numbers[1])
+    else:
+        root = nuke.root()
+        first, last = int(root.firstFrame()), int(root.lastFrame())
+
+    return min(first, last), max(first, last)
+
+
+def evaluate_range(knob, dimension, first, last):
+    values = array('d')
+    times = array('d')
+    index = dimension if dimension >= 0 else 0
+
+    for frame in range(first, last + 1):
+        start = timer()
+        value = knob.getValueAt(frame, index)
+        times.append(timer() - start)
+
+        values.append(float(value))
+
+    return values, times
+
+
+def discontinuities(values, first, factor=10.0):
+    diffs = []
+
+    for i in range(1, len(values)):
+        a, b = values[i - 1], values[i]
+        if is_finite(a) and is_finite(b):
+            diffs.append((abs(b - a), first + i))
+
+    if len(diffs) < 3:
+        return []
+
+    steps = sorted(d for d, _ in diffs)
+    median = steps[len(steps) // 2]
+
+    if not median:
+        return [frame for d, frame in diffs if d > 0]
+
+    return [frame for d, frame in diffs if d > median * factor]
+
+
+def is_finite(value):
+    return not (math.isnan(value) or math.isinf(value))
+
+
+def range_report(label, values, times, first, last, vectorized=False):
+    finite = [v for v in values if is_finite(v)]
+    nans = sum(1 for v in values if math.isnan(v))
+    infs = sum(1 for v in values if math.isinf(v))
+    jumps = discontinuities(values, first)
+
+    lines = ['{} : frames {}-{} ( {} frames )'.format(
+        label, first, last, len(values))]
+
+    if finite:
+        lines.append('min: {}  max: {}'.format(min(finite), max(finite)))
+
+    lines.append('nan: {}  inf: {}'.format(nans, infs))
+
+    if jumps:
+        shown = ', '.join(str(f) for f in jumps[:10])
+        more = ' ...' if len(jumps) > 10 else ''
+        lines.append('discontinuities: {} at frames {}{}'.format(
+            len(jumps), shown, more))
+    else:
+        lines.append('discontinuities: 0')
+
+    if vectorized:
+        lines.append('time: {:.6f} ms/frame ( vectorized )'.format(
+            1000.0 * times[0]))
+
+    elif times:
+        slowest = max(range(len(times)), key=lambda i: times[i])
+        lines.append('time: {:.4f} ms/frame ( slowest {:.4f} ms at frame {} )'.format(
+            1000.0 * sum(times) / len(times), 1000.0 * times[slowest], first + slowest))
+
+    return '\n'.join(lines)
@@ -0,0 +1,84 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+
+import nuke  # type: ignore
+
+from .bounded_cache import bounded_cache
+
+results = bounded_cache(256)
+pending = {}
+
+
+class expression_result(object):
+    def __init__(self, value=None, error=''):
+        self.value = value
+        self.error = error
+
+    def __str__(self):
+        if self.error:
+            return 'ERROR: {}'.format(self.error)
+
+        return str(self.value)
+
+
+def line_count(code):
+    lines = code.split('\n')
+    lines = [line for line in lines if line.strip()]
+
+    return len(lines)
+
+
+def build_expression(code, syntax='python'):
+    if syntax == 'python':
+        if line_count(code) > 1 or 'ret=' in code or 'ret ' in code:
+            code = code.replace('\n', '\\n').replace(
+                ']', '\\]').replace('[', '\\[').replace(' ', '\\ ')
+
+            return '[python -execlocal {} ]'.format(code)
+
+        return '[python {}]'.format(code.replace('\n', '').strip())
+
+    if any(w in code for w in ['return', 'set', 'expr']):
+        return '[' + code + ']'
+
+    return code
+
+
+def evaluate_pending():
+    try:
+        pending['value'] = nuke.expression(pending['expression'])
+    except Exception as e:
+        pending['error'] = str(e).strip() or e.__class__.__name__
+
+
+def evaluate(node, knob, code, syntax='tcl'):
+    pending.clear()
+    pending['expression'] = build_expression(code, syntax)
+
+    context = '{}.{}'.format(node.fullName(), knob.name())
+    command = 'import sys; sys.modules[{!r}].evaluate_pending()'.format(
+        __name__)
+
+    try:
+        nuke.runIn(context, command)
+    except Exception as e:
+        pending['error'] = str(e).strip() or e.__class__.__name__
+
+    return expression_result(pending.get('value'), pending.get('error', ''))
+
+
+def evaluate_cached(node, knob, code, syntax='tcl'):
+    key = (node.fullName(), knob.name(), nuke.frame(),
+           syntax, re.sub('\\s+', ' ', code))
+
+    result = results.get(key)
+
+    if not result:
+        result = evaluate(node, knob, code, syntax)
+        results.set(key, result)
+
+    return result
@@ -0,0 +1,311 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import time
+from heapq import nsmallest
+
+import nuke  # type: ignore
+
+from ..nuke_util.pyside import (
+    Qt,
+    QTimer,
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QLineEdit,
+    QTableWidget,
+    QTableWidgetItem,
+    QAbstractItemView,
+)
+
+from .comp_knobs import all_nodes, expression_dimensions
+from .output_sections import tokenize, token_pattern
+
+CHUNK_NODES = 200
+MAX_RESULTS = 500
+
+python_classes = ['PythonKnob', 'PythonCustomKnob', 'Multiline_Eval_String_Knob']
+
+callback_knobs = [
+    'knobChanged', 'onCreate', 'onDestroy', 'updateUI', 'autolabel',
+    'beforeRender', 'beforeFrameRender', 'afterFrameRender', 'afterRender',
+    'onScriptLoad', 'onScriptSave', 'onScriptClose'
+]
+
+
+def knob_source(scripter, knob):
+    knob_name = knob.name()
+    knob_class = knob.Class()
+
+    if knob_name == 'kernelSource':
+        return 'blink', scripter.get_blinkscript_source(knob)
+
+    if knob_name in callback_knobs:
+        return 'callback', knob.value()
+
+    if knob_class in python_classes:
+        return 'python', knob.toScript()
+
+    if knob_class == 'PyScript_Knob':
+        return 'button', knob.value()
+
+    if knob.hasExpression():
+        exprs = [expr for _, _, expr in expression_dimensions(scripter, knob)]
+        return 'expression', '\n'.join(exprs)
+
+    return None
+
+
+def snippet(text, tokens):
+    for line in text.split('\n'):
+        lower = line.lower()
+        if any(token in lower for token in tokens):
+            return line.strip()[:200]
+
+    return text.strip().split('\n')[0][:200]
+
+
+class knob_index(object):
+    def __init__(self):
+        self.scripter = None
+        self.timer = None
+        self.pending = []
+        self.hooks_installed = False
+        self.clear()
+
+    def clear(self):
+        self.tokens = {}
+        self.entries = {}
+        self.node_knobs = {}
+        self.built = False
+
+    def add(self, knob_id, node_name, kind, text):
+        self.remove(knob_id)
+
+        if not text or not text.strip():
+            return
+
+        tokens = tokenize(text)
+        self.entries[knob_id] = (kind, text, tokens)
+        self.node_knobs.setdefault(node_name, set()).add(knob_id)
+
+        for token in tokens:
+            self.tokens.setdefault(token, set()).add(knob_id)
+
+    def remove(self, knob_id):
+        entry = self.entries.pop(knob_id, None)
+        if not entry:
+            return
+
+        for token in entry[2]:
+            ids = self.tokens.get(token)
+            if not ids:
+                continue
+
+            ids.discard(knob_id)
+            if not ids:
+                del self.tokens[token]
+
+    def update_knob(self, node, knob):
+        node_name = node.fullName()
+        knob_id = '{}.{}'.format(node_name, knob.name())
+        source = knob_source(self.scripter, knob)
+
+        if source:
+            self.add(knob_id, node_name, *source)
+        else:
+            self.remove(knob_id)
+
+    def update_node(self, node):
+        self.remove_node(node.fullName())
+
+        for knob in node.knobs().values():
+            self.update_knob(node, knob)
+
+    def remove_node(self, node_name):
+        for knob_id in self.node_knobs.pop(node_name, ()):
+            self.remove(knob_id)
+
+    def start(self, scripter):
+        self.scripter = scripter
+        self.install_hooks()
+        self.clear()
+
+        self.pending = [nuke.root()] + all_nodes()
+        self.started = time.time()
+
+        if not self.timer:
+            self.timer = QTimer()
+            self.timer.timeout.connect(self.index_chunk)
+
+        self.timer.start(0)
+
+    def index_chunk(self):
+        chunk = self.pending[-CHUNK_NODES:]
+        del self.pending[-CHUNK_NODES:]
+
+        for node in chunk:
+            try:
+                self.update_node(node)
+            except ValueError:
+                # deleted while it was waiting to be indexed
+                continue
+
+        if self.pending:
+            return
+
+        self.timer.stop()
+        self.built = True
+        print('knob index: {} knobs of {} nodes indexed in {:.2f}s'.format(
+            len(self.entries), len(self.node_knobs), time.time() - self.started))
+
+    def indexing(self):
+        return bool(self.pending)
+
+    def install_hooks(self):
+        if self.hooks_installed:
+            return
+
+        nuke.addKnobChanged(self.knob_changed)
+        nuke.addOnCreate(self.node_created)
+        nuke.addOnDestroy(self.node_destroyed)
+        self.hooks_installed = True
+
+    def knob_changed(self):
+        if not self.scripter:
+            return
+
+        node = nuke.thisNode()
+        knob = nuke.thisKnob()
+
+        if knob.name() == 'name':
+            for name in [n for n in self.node_knobs if not nuke.toNode(n)]:
+                self.remove_node(name)
+
+            self.update_node(node)
+
+            if hasattr(node, 'begin'):
+                for child in nuke.allNodes(group=node, recurseGroups=True):
+                    self.update_node(child)
+
+        else:
+            self.update_knob(node, knob)
+
+    def node_created(self):
+        if self.scripter:
+            self.update_node(nuke.thisNode())
+
+    def node_destroyed(self):
+        if self.scripter:
+            self.remove_node(nuke.thisNode().fullName())
+
+    def search(self, query, limit=MAX_RESULTS):
+        words = tokenize(query)
+        if not words:
+            return 0, []
+
+        # the last word can be incomplete while typing, it matches as a prefix
+        last = ''
+        if not query[-1].isspace():
+            last = token_pattern.findall(query)[-1].lower()
+
+        sets = [self.tokens.get(word, set()) for word in words if not word == last]
+
+        if last:
+            prefix_ids = set()
+            for token, ids in self.tokens.items():
+                if token.startswith(last):
+                    prefix_ids |= ids
+
+            sets.append(prefix_ids)
+
+        sets.sort(key=len)
+        result = set(sets[0])
+
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+
+        return len(result), nsmallest(limit, result)
+
+
+index = knob_index()
+
+
+class knob_search_widget(QWidget):
+    def __init__(self, scripter):
+        QWidget.__init__(self, scripter)
+        self.scripter = scripter
+        self.results = []
+
+        self.setWindowFlags(Qt.Tool)
+        self.setWindowTitle('Search Comp Code')
+        self.resize(800, 500)
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText(
+            'Search python knobs, buttons, callbacks, expressions and blink kernels')
+        self.query_edit.textChanged.connect(self.search)
+
+        self.info_label = QLabel()
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(['Node', 'Knob', 'Kind', 'Line'])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.cellDoubleClicked.connect(self.enter_row)
+
+        layout.addWidget(self.query_edit)
+        layout.addWidget(self.info_label)
+        layout.addWidget(self.table)
+
+    def set_query(self, query):
+        if query:
+            self.query_edit.setText(query)
+        else:
+            self.search(self.query_edit.text())
+
+        self.query_edit.setFocus()
+
+    def search(self, query):
+        start = time.time()
+        count, self.results = index.search(query)
+        elapsed = time.time() - start
+
+        words = tokenize(query)
+
+        state = ' ( indexing... )' if index.indexing() else ''
+        self.info_label.setText(
+            '{} knobs found in {:.2f} ms, {} knobs indexed{} ( double click to edit )'.format(
+                count, elapsed * 1000, len(index.entries), state))
+
+        self.table.setRowCount(len(self.results))
+
+        for row, knob_id in enumerate(self.results):
+            node_name, knob_name = knob_id.rsplit('.', 1)
+            kind, text, _ = index.entries[knob_id]
+
+            values = [node_name, knob_name, kind, snippet(text, words)]
+
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+
+        self.table.resizeColumnsToContents()
+
+    def enter_row(self, row, _=0):
+        node_name, knob_name = self.results[row].rsplit('.', 1)
+
+        node = nuke.root() if node_name == 'root' else nuke.toNode(node_name)
+        if not node or not node.knob(knob_name):
+            return
+
+        self.scripter.enter(node)
+        self.scripter.toolbar.knob_selector.setCurrentText(knob_name)
@@ -0,0 +1,75 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import sys
+
+from .execution import PSEUDO_DIR
+from .timing import timer
+
+
+class line_profiler(object):
+    # same enable/disable interface as cProfile, only the frames of the
+    # scripter code are traced, the libraries they call run untraced
+    def __init__(self):
+        self.times = {}
+        self.hits = {}
+        self.frames = {}
+        self.previous_trace = None
+        self.elapsed = 0.0
+
+    def enable(self):
+        self.previous_trace = sys.gettrace()
+        self.start = timer()
+        sys.settrace(self.trace_call)
+
+    def disable(self):
+        sys.settrace(self.previous_trace)
+        self.elapsed += timer() - self.start
+
+    def trace_call(self, frame, event, arg):
+        if not frame.f_code.co_filename.startswith(PSEUDO_DIR):
+            return None
+
+        self.frames[id(frame)] = (None, timer())
+        return self.trace_line
+
+    def trace_line(self, frame, event, arg):
+        now = timer()
+        key = id(frame)
+        line, start = self.frames.get(key, (None, now))
+
+        if line is not None:
+            self.times[line] = self.times.get(line, 0.0) + now - start
+
+        if event == 'line':
+            self.hits[frame.f_lineno] = self.hits.get(frame.f_lineno, 0) + 1
+            self.frames[key] = (frame.f_lineno, timer())
+
+        elif event == 'return':
+            self.frames.pop(key, None)
+
+        else:
+            self.frames[key] = (line, timer())
+
+        return self.trace_line
+
+    def line_times(self):
+        return dict((line, (self.times.get(line, 0.0), hits))
+                    for line, hits in self.hits.items())
+
+    def report(self, code, top=10):
+        lines = code.split('\n')
+        slowest = sorted(self.times.items(), key=lambda t: t[1], reverse=True)[:top]
+
+        # the time of a line includes the functions it calls
+        output = ['line profile: {:.3f}s, {} lines run, slowest:'.format(
+            self.elapsed, len(self.hits))]
+
+        for line, seconds in slowest:
+            source = lines[line - 1].strip() if 0 < line <= len(lines) else ''
+            output.append('    line {:<5} {:>10.3f} ms {:>8} hits | {}'.format(
+                line, seconds * 1000, self.hits.get(line, 0), source[:80]))
+
+        return '\n'.join(output) + '\n'
@@ -0,0 +1,107 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import sys
+from collections import deque
+
+
+class capture_stream(object):
+    def __init__(self, capture, tee=None):
+        self.capture = capture
+        self.tee = tee
+
+    def write(self, text):
+        self.capture.write(text)
+
+        if self.tee:
+            self.tee.write(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self.tee:
+            self.tee.flush()
+
+    def isatty(self):
+        return False
+
+    def __getattr__(self, name):
+        # encoding, errors, fileno... are those of the replaced stream
+        return getattr(self.tee, name)
+
+
+class output_capture(object):
+    CHUNK_SIZE = 64 * 1024
+    MAX_SIZE = 4 * 1024 * 1024
+
+    def __init__(self):
+        self.chunks = deque()
+        self.size = 0
+        self.pending = []
+        self.pending_size = 0
+        self.dropped = 0
+        self.streams = None
+
+    def start(self):
+        if self.streams:
+            return
+
+        self.streams = sys.stdout, sys.stderr
+        # the replaced streams still receive the output, other redirections
+        # installed in Nuke keep working during a capture
+        sys.stdout = capture_stream(self, self.streams[0])
+        sys.stderr = capture_stream(self, self.streams[1])
+
+    def stop(self):
+        if not self.streams:
+            return
+
+        sys.stdout, sys.stderr = self.streams
+        self.streams = None
+
+    def write(self, text):
+        if not text:
+            return
+
+        self.pending.append(text)
+        self.pending_size += len(text)
+
+        if self.pending_size >= self.CHUNK_SIZE:
+            self.roll_chunk()
+
+    def roll_chunk(self):
+        if not self.pending:
+            return
+
+        self.chunks.append(''.join(self.pending))
+        self.size += self.pending_size
+
+        self.pending = []
+        self.pending_size = 0
+
+        while self.size > self.MAX_SIZE and len(self.chunks) > 1:
+            chunk = self.chunks.popleft()
+            self.size -= len(chunk)
+            self.dropped += len(chunk)
+
+    def take(self):
+        self.roll_chunk()
+
+        if not self.chunks and not self.dropped:
+            return ''
+
+        text = ''.join(self.chunks)
+
+        if self.dropped:
+            text = '... {} characters dropped ...\n{}'.format(
+                self.dropped, text)
+
+        self.chunks.clear()
+        self.size = 0
+        self.dropped = 0
+
+        return text
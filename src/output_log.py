@@ -0,0 +1,103 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import os
+import mmap
+import atexit
+import tempfile
+from array import array
+from sys import version_info
+
+offset_type = 'Q' if version_info.major == 3 else 'L'
+
+
+class output_log(object):
+    def __init__(self, name):
+        folder = os.path.join(tempfile.gettempdir(), 'vina_scripter')
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+        self.path = os.path.join(
+            folder, '{}_{}.log'.format(name, os.getpid()))
+
+        self.file = open(self.path, 'wb')
+        self.reader = open(self.path, 'rb')
+        self.map = None
+
+        self.size = 0
+        self.offsets = array(offset_type, [0])
+
+        atexit.register(self.close)
+
+    def line_count(self):
+        return len(self.offsets)
+
+    def has_partial_line(self):
+        return self.size > self.offsets[-1]
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        if not data:
+            return
+
+        self.file.write(data)
+
+        index = data.find(b'\n')
+        while index >= 0:
+            self.offsets.append(self.size + index + 1)
+            index = data.find(b'\n', index + 1)
+
+        self.size += len(data)
+
+    def read(self, start, end):
+        if end <= start:
+            return ''
+
+        self.file.flush()
+
+        if not self.map or len(self.map) < end:
+            self.close_map()
+            self.map = mmap.mmap(
+                self.reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return self.map[start:end].decode('utf-8', 'replace')
+
+    def read_lines(self, first, last):
+        count = self.line_count()
+        first = max(0, min(first, count))
+        last = max(first, min(last, count))
+
+        start = self.offsets[first]
+        end = self.offsets[last] if last < count else self.size
+
+        return self.read(start, end)
+
+    def close_map(self):
+        if self.map:
+            self.map.close()
+            self.map = None
+
+    def clear(self):
+        self.close_map()
+
+        self.file.seek(0)
+        self.file.truncate()
+
+        self.size = 0
+        self.offsets = array(offset_type, [0])
+
+    def close(self):
+        self.close_map()
+
+        if self.file.closed:
+            return
+
+        self.file.close()
+        self.reader.close()
+
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
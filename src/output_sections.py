@@ -0,0 +1,141 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+import time
+from bisect import bisect_left, bisect_right
+from array import array
+
+from .output_log import offset_type
+
+token_pattern = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return set(token.lower() for token in token_pattern.findall(text))
+
+
+def contains(lines, line):
+    index = bisect_left(lines, line)
+    return index < len(lines) and lines[index] == line
+
+
+class output_section(object):
+    def __init__(self, number, label, syntax, start_line):
+        self.number = number
+        self.label = label
+        self.syntax = syntax
+        self.start_line = start_line
+        self.end_line = start_line
+        self.start_time = time.time()
+        self.duration = 0.0
+        self.status = 'running'
+
+    def finish(self, status, end_line):
+        self.status = status
+        self.end_line = end_line
+        self.duration = time.time() - self.start_time
+
+    def is_error(self):
+        return self.status in ['traceback', 'tcl error']
+
+    def match_status(self, status):
+        if not status:
+            return True
+
+        if status == 'error':
+            return self.is_error()
+
+        return self.status.startswith(status)
+
+    def header(self):
+        return '# [{}] {} {} | {} | {:.3f}s | lines {}-{}'.format(
+            self.number, self.syntax, self.label, self.status,
+            self.duration, self.start_line + 1, self.end_line)
+
+
+class output_sections(object):
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.sections = []
+        self.starts = []
+
+    def begin(self, label, syntax, start_line):
+        section = output_section(
+            len(self.sections) + 1, label, syntax, start_line)
+
+        self.sections.append(section)
+        self.starts.append(start_line)
+
+        return section
+
+    def get(self, number):
+        if number < 1 or number > len(self.sections):
+            return None
+
+        return self.sections[number - 1]
+
+    def at_line(self, line):
+        index = bisect_right(self.starts, line) - 1
+        if index < 0:
+            return None
+
+        section = self.sections[index]
+
+        if section.status == 'running' or line < section.end_line:
+            return section
+
+        return None
+
+    def filter(self, status=''):
+        return [s for s in self.sections if s.match_status(status)]
+
+
+class output_index(object):
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.tokens = {}
+        self.pending = ''
+        self.pending_line = 0
+
+    def add(self, line, text):
+        if not self.pending:
+            self.pending_line = line
+
+        lines = (self.pending + text).split('\n')
+        self.pending = lines.pop()
+
+        for i, line_text in enumerate(lines):
+            self.add_line(self.pending_line + i, line_text)
+
+        self.pending_line += len(lines)
+
+    def add_line(self, line, text):
+        for token in tokenize(text):
+            lines = self.tokens.get(token)
+
+            if lines is None:
+                lines = self.tokens[token] = array(offset_type)
+
+            lines.append(line)
+
+    def search(self, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        lists = sorted([self.tokens.get(t, []) for t in tokens], key=len)
+
+        result = [line for line in lists[0]
+                  if all(contains(lines, line) for lines in lists[1:])]
+
+        if self.pending and tokens <= tokenize(self.pending):
+            result.append(self.pending_line)
+
+        return result
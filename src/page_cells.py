@@ -0,0 +1,53 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import re
+
+from .bounded_cache import source_hash
+
+cell_marker = re.compile(r'^\s*#\s*%%')
+
+
+class page_cell(object):
+    def __init__(self, number, first_line, lines):
+        self.number = number
+        self.first_line = first_line
+        self.code = '\n'.join(lines)
+        self.last_line = first_line + len(lines) - 1
+        self.hash = source_hash(self.code)
+
+    def is_empty(self):
+        return not any(line.strip() and not line.lstrip().startswith('#')
+                       for line in self.code.split('\n'))
+
+    def label(self):
+        return 'cell {} lines {}-{}'.format(
+            self.number + 1, self.first_line + 1, self.last_line + 1)
+
+
+def split_cells(code):
+    cells = []
+    lines = []
+    first_line = 0
+
+    for line_number, line in enumerate(code.split('\n')):
+        if cell_marker.match(line) and line_number > 0:
+            cells.append(page_cell(len(cells), first_line, lines))
+            lines = []
+            first_line = line_number
+
+        lines.append(line)
+
+    cells.append(page_cell(len(cells), first_line, lines))
+
+    return cells
+
+
+def cell_at_line(cells, line):
+    for cell in cells:
+        if cell.first_line <= line <= cell.last_line:
+            return cell
+
+    return cells[-1]
@@ -0,0 +1,57 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import sys
+
+# page index -> globals of the page, they live until reset or the page is closed
+namespaces = {}
+
+# page index -> {cell number: hash of the cell source that last succeeded}
+cell_hashes = {}
+
+
+def namespace(page):
+    globals_dict = namespaces.get(page)
+
+    if globals_dict is None:
+        globals_dict = dict(sys.modules['__main__'].__dict__)
+        namespaces[page] = globals_dict
+
+    return globals_dict
+
+
+def reset(page=None):
+    if page is None:
+        namespaces.clear()
+        cell_hashes.clear()
+    else:
+        namespaces.pop(page, None)
+        cell_hashes.pop(page, None)
+
+
+def remove_page(page):
+    reset(page)
+
+    for pages in [namespaces, cell_hashes]:
+        for index in sorted(p for p in pages if p > page):
+            pages[index - 1] = pages.pop(index)
+
+
+def keep_page(page):
+    for pages in [namespaces, cell_hashes]:
+        kept = pages.get(page)
+        pages.clear()
+
+        if not kept is None:
+            pages[0] = kept
+
+
+def cell_succeeded(page, cell):
+    cell_hashes.setdefault(page, {})[cell.number] = cell.hash
+
+
+def changed_cells(page, cells):
+    hashes = cell_hashes.get(page, {})
+    return [c for c in cells if not hashes.get(c.number) == c.hash and not c.is_empty()]
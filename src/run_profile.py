@@ -0,0 +1,42 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import os
+import re
+import pstats
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+
+def stats_path(state_file, label):
+    name = re.sub(r'[^\w\.]+', '_', label).strip('_')
+    return os.path.join(os.path.dirname(state_file), 'vina_scripter_{}.pstats'.format(name))
+
+
+def profile_report(profiler, top=20, path=None):
+    # a run that fails before any code runs, like a SyntaxError, leaves the
+    # profiler empty and pstats refuses to load it
+    if not profiler.getstats():
+        return 'no profile data\n'
+
+    stream = StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+
+    if path:
+        stats.dump_stats(path)
+
+    stats.strip_dirs()
+
+    for key, title in [('cumulative', 'cumulative time'), ('tottime', 'total time')]:
+        stream.write('top {} by {}:\n'.format(top, title))
+        stats.sort_stats(key).print_stats(top)
+
+    if path:
+        stream.write('stats saved to {}\n'.format(path))
+
+    return stream.getvalue()
@@ -7,48 +7,31 @@ from ..nuke_util.pyside import (
     Qt,
     QTimer,
     QFont,
+    QTextCursor,
     QTextEdit,
-    QApplication,
-    QSplitter,
 )
 
-nuke_console = None
+from .output_capture import output_capture
+from .output_log import output_log
+from .output_sections import output_sections, output_index
+from .widget_locator import get_nuke_console
 
 
-def get_nuke_script_editor():
-    for widget in QApplication.allWidgets():
-        if widget.metaObject().className() == 'Nuke::NukeScriptEditor':
-            return widget
+def console_length(console):
+    return console.document().characterCount() - 1
 
 
-def get_nuke_console():
-    global nuke_console
+def console_text(console, start):
+    cursor = QTextCursor(console.document())
+    cursor.setPosition(start)
+    cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
 
-    if nuke_console:
-        return nuke_console
-
-    se = get_nuke_script_editor()
-
-    if not se:
-        return
-
-    children = se.children()
-    splitter = [w for w in children if isinstance(w, QSplitter)]
-
-    if not splitter:
-        return
-
-    splitter = splitter[0]
-    for widget in splitter.children():
-        if widget.metaObject().className() == 'Foundry::PythonUI::ScriptOutputWidget':
-            nuke_console = widget
-            return widget
-
-    return None
+    return cursor.selectedText().replace(u'\u2029', '\n')
 
 
 class output_widget(QTextEdit):
     MAX_LINES = 1000
+    PAGE_LINES = 200
 
     def __init__(self, parent):
         QTextEdit.__init__(self, parent)
@@ -61,23 +44,257 @@ class output_widget(QTextEdit):
         self.timer.setInterval(10)
         self.timer.timeout.connect(self.flush)
 
-    def flush(self):
-        nuke_console = get_nuke_console()
-        if nuke_console:
-            lines = nuke_console.toPlainText().split('\n')
-            self.setPlainText('\n'.join(lines[-self.MAX_LINES:]))
-            self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        self.capture = output_capture()
+        self.capture_timer = QTimer(self)
+        self.capture_timer.setInterval(50)
+        self.capture_timer.timeout.connect(self.flush_capture)
 
-    def update_output(self):
+        self.log = output_log('float' if parent.float_panel else 'panel')
+        self.first_line = 0
+        self.last_line = 1
+        self.follow = True
+        self.paging = False
+
+        self.sections = output_sections()
+        self.index = output_index()
+        self.view = False
+
+        self.verticalScrollBar().valueChanged.connect(self.scrolled)
+
+    def flush(self):
         nuke_console = get_nuke_console()
         if not nuke_console:
             return
 
-        text = nuke_console.toPlainText()
-        if len(text) > self.last_pos:
-            self.last_pos = len(text)
-            if not self.timer.isActive():
-                self.timer.start()
+        length = console_length(nuke_console)
+
+        if length < self.last_pos:
+            self.last_pos = 0
+
+        if length == self.last_pos:
+            return
+
+        text = console_text(nuke_console, self.last_pos)
+        self.last_pos = length
+
+        self.append_text(text)
+
+    def append_text(self, text):
+        self.index.add(self.log.line_count() - 1, text)
+        self.log.write(text)
+
+        if not self.follow:
+            return
+
+        self.paging = True
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+
+        self.last_line = self.log.line_count()
+        self.remove_first_lines(self.last_line - self.first_line - self.MAX_LINES)
+
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        self.paging = False
+
+    def remove_first_lines(self, count):
+        if count <= 0:
+            return
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.Start)
+        cursor.movePosition(
+            QTextCursor.NextBlock, QTextCursor.KeepAnchor, count)
+        cursor.removeSelectedText()
+
+        self.first_line += count
+
+    def remove_last_lines(self, count):
+        if count <= 0:
+            return
+
+        document = self.document()
+        block = document.findBlockByNumber(document.blockCount() - count - 1)
+
+        cursor = QTextCursor(document)
+        cursor.setPosition(block.position() + block.length() - 1)
+        cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+
+        self.last_line -= count
+        self.follow = False
+
+    def block_top(self, number):
+        block = self.document().findBlockByNumber(number)
+        layout = self.document().documentLayout()
+
+        return layout.blockBoundingRect(block).top()
+
+    def scrolled(self, value):
+        if self.paging or self.view:
+            return
+
+        scrollbar = self.verticalScrollBar()
+
+        if value == scrollbar.minimum() and self.first_line > 0:
+            self.page_up()
+
+        elif value == scrollbar.maximum() and not self.follow:
+            self.page_down()
+
+    def page_up(self):
+        self.paging = True
+
+        count = min(self.PAGE_LINES, self.first_line)
+        text = self.log.read_lines(self.first_line - count, self.first_line)
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText(text)
+
+        self.first_line -= count
+        self.remove_last_lines(
+            self.last_line - self.first_line - self.MAX_LINES)
+
+        self.verticalScrollBar().setValue(int(self.block_top(count)))
+        self.paging = False
+
+    def page_down(self):
+        self.paging = True
+
+        line_count = self.log.line_count()
+        count = min(self.PAGE_LINES, line_count - self.last_line)
+
+        text = self.log.read_lines(self.last_line, self.last_line + count)
+        self.follow = self.last_line + count == line_count
+
+        if not self.follow:
+            text = text[:-1]
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText('\n' + text)
+
+        anchor = self.last_line - 1
+        self.last_line += count
+        self.remove_first_lines(
+            self.last_line - self.first_line - self.MAX_LINES)
+
+        anchor_bottom = self.block_top(anchor - self.first_line + 1)
+        self.verticalScrollBar().setValue(
+            int(anchor_bottom - self.viewport().height()))
+
+        self.paging = False
+
+    def begin_section(self, label, syntax):
+        self.flush()
+        self.flush_capture()
+
+        # a new run brings the console back from a view to the live output
+        if self.view:
+            self.show_tail()
+
+        return self.sections.begin(label, syntax, self.log.line_count() - 1)
+
+    def end_section(self, section, status):
+        self.flush()
+        self.flush_capture()
+
+        end_line = self.log.line_count()
+        if not self.log.has_partial_line():
+            end_line -= 1
+
+        section.finish(status, max(end_line, section.start_line))
+
+    def show_view(self, lines):
+        self.view = True
+        self.follow = False
+
+        self.paging = True
+        self.setPlainText('\n'.join(lines))
+        self.paging = False
+
+    def show_tail(self):
+        self.view = False
+        self.follow = True
+
+        line_count = self.log.line_count()
+        self.first_line = max(0, line_count - self.MAX_LINES)
+        self.last_line = line_count
+
+        self.paging = True
+        self.setPlainText(self.log.read_lines(self.first_line, line_count))
+        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        self.paging = False
+
+    def show_sections(self, status=''):
+        sections = self.sections.filter(status)
+        lines = [s.header() for s in sections[-self.MAX_LINES:]]
+
+        if not lines:
+            lines = ['# No sections found']
+
+        self.show_view(lines)
+
+    def show_section(self, number):
+        section = self.sections.get(int(number)) if number.isdigit() else None
+
+        if not section:
+            print("'{}' section does not exist !".format(number))
+            return
+
+        end_line = min(section.end_line, section.start_line + self.MAX_LINES)
+        text = self.log.read_lines(section.start_line, end_line)
+
+        self.show_view([section.header(), text.rstrip('\n')])
+
+    def find(self, query):
+        found = self.index.search(query)
+        lines = []
+        current_section = None
+
+        for line in found[:self.MAX_LINES]:
+            section = self.sections.at_line(line)
+
+            if section and not section is current_section:
+                lines.append(section.header())
+                current_section = section
+
+            text = self.log.read_lines(line, line + 1).rstrip('\n')
+            lines.append('{}: {}'.format(line + 1, text))
+
+        if len(found) > self.MAX_LINES:
+            lines.append('# ... {} more matches'.format(
+                len(found) - self.MAX_LINES))
+
+        if not found:
+            lines = ["# '{}' not found".format(query)]
+
+        self.show_view(lines)
+
+    def start_capture(self):
+        self.flush()
+        self.capture.start()
+        self.capture_timer.start()
+
+    def stop_capture(self):
+        self.capture.stop()
+        self.capture_timer.stop()
+        self.flush_capture()
+
+    def flush_capture(self):
+        text = self.capture.take()
+        if text:
+            self.append_text(text)
+
+    def showEvent(self, event):
+        self.flush()
+        super(output_widget, self).showEvent(event)
+
+    def update_output(self):
+        if not self.timer.isActive():
+            self.timer.start()
 
     def clear_all(self):
         nuke_console = get_nuke_console()
@@ -88,6 +305,15 @@ class output_widget(QTextEdit):
         nuke_console.clear()
         self.last_pos = 0
 
+        self.log.clear()
+        self.first_line = 0
+        self.last_line = 1
+        self.follow = True
+
+        self.sections.clear()
+        self.index.clear()
+        self.view = False
+
     def add_output(self, output):
         nuke_console = get_nuke_console()
         if not nuke_console:
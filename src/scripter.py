@@ -4,9 +4,11 @@
 # WEBSITE -------> https://vinavfx.com
 # -----------------------------------------------------------
 import traceback
+import cProfile
+import time
 import os
 import re
-from sys import version_info
+from contextlib import contextmanager
 
 from ..nuke_util.pyside import (
     Qt,
@@ -16,7 +18,6 @@ from ..nuke_util.pyside import (
     QShortcut,
     QSplitter,
     QApplication,
-    QTextEdit,
     QWidget,
 )
 
@@ -25,6 +26,29 @@ import nuke
 from .editor import multi_editor_widget
 from .script_output import output_widget
 from .toolbar import toolbar_widget
+from .expressions import build_expression, evaluate_cached, results
+from .expression_range import parse_frame_range, evaluate_range, range_report
+from .expression_numpy import evaluate_vectorized
+from .expression_bake import store_source, bake_values, unbake
+from . import compiled_expressions
+from . import page_namespaces
+from . import execution
+from .run_profile import stats_path, profile_report
+from .line_profile import line_profiler
+from .page_cells import split_cells, cell_at_line
+from .expression_convert import python_to_tcl, measure
+from .expression_profiler import profile_comp, profiler_widget
+from .expression_graph import show_dependencies, graph
+from .knob_index import index, knob_search_widget
+from .comp_replace import find_hits, find_knob, apply_hits, replace_widget
+from .batch import (
+    undo_group,
+    suspended_callbacks,
+    deferred_callbacks,
+    suspended_repaint,
+    fast_run,
+)
+from .bounded_cache import bounded_cache, source_hash
 
 from ..python_util.util import jread, jwrite
 from ..nuke_util.nuke_util import get_nuke_path
@@ -63,12 +87,12 @@ class scripter_widget(QWidget):
         layout.addWidget(splitter)
 
         self.current_node = None
+        self.current_nodes = []
         self.current_node_name = ''
         self.current_node_obj_name = ''
 
         self.current_knob = None
         self.modified_knob = False
-        self.tcl_errors = {}
 
         self.activated_knob_changed = True
 
@@ -76,9 +100,44 @@ class scripter_widget(QWidget):
         self.state = {
             'pages': [''],
             'current_page': 0,
-            'vim_mode': True
+            'vim_mode': True,
+            'capture_output': False,
+            'keep_baked_source': True,
+            'compiled_expressions': False,
+            'fast_run': False,
+            'persistent_namespaces': False
         }
 
+        self.options = [
+            ('capture', 'capture_output', 'Capture Output'),
+            ('keepsource', 'keep_baked_source', 'Keep Source when Baking'),
+            ('compiled', 'compiled_expressions', 'Compiled Python Expressions'),
+            ('fastrun', 'fast_run', 'Fast Run ( suspend callbacks, autosave and redraw )'),
+            ('persistent', 'persistent_namespaces', 'Persistent Page Namespaces')
+        ]
+
+        self.run_actions = [
+            ('Evaluate over Range', self.evaluate_range),
+            ('Bake Expression', self.bake),
+            ('Unbake Expression', self.unbake),
+            ('Convert Expression to Tcl', self.convert_to_tcl),
+            ('Profile Comp Expressions', self.profile_expressions),
+            ('Expression Dependencies', self.show_dependencies),
+            ('Search Comp Code', self.search_comp),
+            ('Replace in Comp', self.replace_in_comp),
+            ('Run for each Selected Node', self.execute_for_each_node),
+            ('Profile Run', self.profile_script),
+            ('Line Profile Run', self.line_profile_script),
+            ('Run Current Cell', self.execute_cell),
+            ('Run Changed Cells', self.execute_changed_cells),
+            ('Reset Page Namespace', self.reset_namespace)
+        ]
+
+        self.profiler = None
+        self.knob_search = None
+        self.run_times = bounded_cache(64)
+        self.replace_preview = None
+
         self.exit_node()
 
         nuke.addOnDestroy(lambda: self.exit_node(True)
@@ -107,6 +166,8 @@ class scripter_widget(QWidget):
         jwrite(self.state_file, self.state)
 
     def knob_changed(self):
+        results.clear()
+
         if not self.current_knob == nuke.thisKnob():
             return
 
@@ -117,8 +178,10 @@ class scripter_widget(QWidget):
             return
 
         node = self.current_node
+        nodes = self.current_nodes
+
         self.exit_node()
-        self.enter(node)
+        self.enter(node, nodes=nodes)
 
     def restore_state(self):
         if self.restored_state:
@@ -127,7 +190,7 @@ class scripter_widget(QWidget):
         self.restored_state = True
 
         if os.path.isfile(self.state_file):
-            self.state = jread(self.state_file)
+            self.state.update(jread(self.state_file))
 
         for page in range(len(self.state['pages'])):
             self.toolbar.add_page(page)
@@ -142,6 +205,21 @@ class scripter_widget(QWidget):
         self.editor.set_vim_mode(checked)
         self.state['vim_mode'] = checked
 
+    def set_option(self, option, value=None):
+        name = option.strip()
+
+        if value is None:
+            value = not name.startswith('no')
+            if not value:
+                name = name[2:]
+
+        for option_name, state_key, _ in self.options:
+            if option_name == name:
+                self.state[state_key] = value
+                return
+
+        print("'{}' option does not exist !".format(option))
+
     def set_script_page(self, page, save_previous=True):
         if self.current_node:
             return
@@ -182,6 +260,7 @@ class scripter_widget(QWidget):
 
         current_page = self.state['current_page']
         del self.state['pages'][current_page]
+        page_namespaces.remove_page(current_page)
 
         for page in range(len(self.state['pages'])):
             self.toolbar.add_page(page)
@@ -205,6 +284,7 @@ class scripter_widget(QWidget):
 
         self.state['current_page'] = 0
         self.state['pages'] = [code]
+        page_namespaces.keep_page(current_page)
 
         self.toolbar.add_page(0)
         self.toolbar.set_page(0)
@@ -309,6 +389,11 @@ class scripter_widget(QWidget):
                 exprs[dimension] = {'value': expr, 'syntax': 'tcl'}
 
             else:
+                source = compiled_expressions.get_source(knob.node(), expr)
+                if source is not None:
+                    exprs[dimension] = {'value': source, 'syntax': 'python'}
+                    return
+
                 if '-execlocal' in expr:
                     expr = expr.split('python -execlocal ')[-1][:-1]
                 else:
@@ -332,12 +417,6 @@ class scripter_widget(QWidget):
 
         return knob.toScript()
 
-    def line_count(self, code):
-        lines = code.split('\n')
-        lines = [line for line in lines if line.strip()]
-
-        return len(lines)
-
     def is_python_expression(self, knob, dimension=0):
         if not knob.hasExpression():
             return False
@@ -360,21 +439,17 @@ class scripter_widget(QWidget):
         return False
 
     def set_expression(self, knob, code, syntax='python', dimension=-1):
-        if syntax == 'python':
-            if self.line_count(code) > 1 or 'ret=' in code or 'ret ' in code:
-                code = code.replace('\n', '\\n').replace(
-                    ']', '\\]').replace('[', '\\[').replace(' ', '\\ ')
+        exp = None
 
-                exp = '[python -execlocal {} ]'.format(code)
+        if syntax == 'python' and self.state['compiled_expressions']:
+            try:
+                exp = compiled_expressions.register(
+                    knob.node(), knob, dimension, code)
+            except SyntaxError:
+                print(traceback.format_exc())
 
-            else:
-                exp = '[python {}]'.format(code.replace('\n', '').strip())
-
-        else:
-            if any(w in code for w in ['return', 'set', 'expr']):
-                exp = '[' + code + ']'
-            else:
-                exp = code
+        if not exp:
+            exp = build_expression(code, syntax)
 
         self.activated_knob_changed = False
         knob.setExpression(exp, dimension)
@@ -425,16 +500,17 @@ class scripter_widget(QWidget):
         nodes = nuke.selectedNodes()
 
         if not nodes:
-            nuke.message('Select only 1 node !')
-            return False
-        if len(nodes) > 1:
-            nuke.message('Select only 1 node !')
+            nuke.message('Select at least 1 node !')
             return False
 
         if not self.current_node:
             self.save_state()
 
-        self.enter(nodes[0])
+        # the last selected node is the one shown in the editor
+        node = nuke.selectedNode()
+        nodes = [node] + [n for n in nodes if not n == node]
+
+        self.enter(node, nodes=nodes)
         return True
 
     def thisDimension(self):
@@ -461,20 +537,35 @@ class scripter_widget(QWidget):
 
         return dimension
 
-    def enter(self, node, knob_expression=None, expr_syntax='python', dimension=-1):
+    def enter(self, node, knob_expression=None, expr_syntax='python', dimension=-1, nodes=None):
         if not self.exit_node(False, True):
             return
 
         self.current_node = node
         self.current_node_name = self.current_node.fullName()
         self.current_node_obj_name = str(self.current_node.__str__)
+        self.current_nodes = nodes or [node]
+
+        if len(self.current_nodes) > 1:
+            node_name = 'Nodes: <b>{}</b> + {}'.format(
+                self.current_node.name(), len(self.current_nodes) - 1)
+        else:
+            node_name = 'Node: <b>{}</b>'.format(self.current_node.name())
 
-        node_name = 'Node: <b>{}</b>'.format(self.current_node.name())
         self.toolbar.current_node_label.setText(node_name)
 
         py_buttons, python_knobs, expressions_knobs = self.get_py_knobs(
             self.current_node)
 
+        if len(self.current_nodes) > 1:
+            def shared(knobs):
+                return [k for k in knobs
+                        if all(n.knob(k.name()) for n in self.current_nodes)]
+
+            py_buttons = shared(py_buttons)
+            python_knobs = shared(python_knobs)
+            expressions_knobs = shared(expressions_knobs)
+
         if knob_expression:
             if not knob_expression.hasExpression(dimension):
                 if type(knob_expression) == nuke.Boolean_Knob:
@@ -545,9 +636,10 @@ class scripter_widget(QWidget):
 
         node = self.current_node
         knob = self.current_knob
+        nodes = self.current_nodes
 
         self.exit_node(True)
-        self.enter(node, knob)
+        self.enter(node, knob, nodes=nodes)
 
     def save(self):
         self.activated_knob_changed = False
@@ -558,31 +650,82 @@ class scripter_widget(QWidget):
             self.activated_knob_changed = True
             return
 
+        if len(self.current_nodes) > 1:
+            self.save_nodes(knob.name())
+        else:
+            self.write_knob(self.current_node, knob)
+
+        self.set_modified_knob(False)
+        self.activated_knob_changed = True
+
+    def write_knob(self, node, knob):
         if knob.Class() in self.python_knobs_list:
             code = self.editor.get_code(0)
 
             if knob.name() == 'kernelSource':
                 knob.fromScript(code)
-                self.current_node.knob('recompile').execute()
+                node.knob('recompile').execute()
             else:
                 knob.setValue(code)
         else:
-            if knob.singleValue():
+            if self.current_knob.singleValue():
                 code = self.editor.get_code(0)
                 syntax = self.editor.get_syntax(0)
-                self.set_expression(self.current_knob, code, syntax)
+                self.set_expression(knob, code, syntax)
 
             else:
+                # the dimensions edited are the ones of the node shown
                 for d in range(knob.arraySize()):
-                    if not knob.hasExpression(d):
+                    if not self.current_knob.hasExpression(d):
                         continue
 
                     code = self.editor.get_code(d)
                     syntax = self.editor.get_syntax(d)
-                    self.set_expression(self.current_knob, code, syntax, d)
+                    self.set_expression(knob, code, syntax, d)
 
-        self.set_modified_knob(False)
-        self.activated_knob_changed = True
+    def save_nodes(self, knob_name):
+        timings = []
+        failed = []
+        written = []
+        start = time.time()
+
+        label = 'Edit {} of {} nodes'.format(knob_name, len(self.current_nodes))
+
+        with undo_group(label), suspended_callbacks(self):
+            for node in self.current_nodes:
+                node_start = time.time()
+
+                try:
+                    node_name = node.fullName()
+                except ValueError:
+                    failed.append(('<deleted node>', 'the node no longer exists'))
+                    continue
+
+                try:
+                    knob = node.knob(knob_name)
+                    if not knob:
+                        raise ValueError('it has no {} knob'.format(knob_name))
+
+                    self.write_knob(node, knob)
+                    written.append(knob)
+                    timings.append((time.time() - node_start, node_name))
+
+                except Exception as e:
+                    failed.append((node_name, str(e)))
+
+        elapsed = time.time() - start
+        mean = sum(t for t, _ in timings) / len(timings) if timings else 0
+
+        print('{} written on {} nodes in {:.3f}s ( {:.3f} ms per node ), {} failed'.format(
+            knob_name, len(timings), elapsed, mean * 1000, len(failed)))
+
+        for node_time, node_name in sorted(timings, reverse=True)[:10]:
+            print('    {} : {:.3f} ms'.format(node_name, node_time * 1000))
+
+        for node_name, error in failed:
+            print('    failed {} : {}'.format(node_name, error))
+
+        self.refresh_knobs(written)
 
     def check_and_save(self):
         if not self.modified_knob:
@@ -613,10 +756,11 @@ class scripter_widget(QWidget):
 
         self.current_knob = None
         self.current_node = None
+        self.current_nodes = []
         self.current_node_name = ''
         self.current_node_obj_name = ''
 
-        self.tcl_errors.clear()
+        results.clear()
 
         self.toolbar.node_edit_mode(False)
 
@@ -637,64 +781,308 @@ class scripter_widget(QWidget):
     def clean_output_console(self):
         self.console.clear_all()
 
-    def get_nuke_error_console(self):
-        def get_all_widgets(widget):
-            widgets = [widget]
-            for child in widget.findChildren(QTextEdit):
-                widgets += get_all_widgets(child)
+    def execute_tcl(self, code, dimension):
+        knob = self.current_knob
+        if not knob:
+            return
 
-            return widgets
+        if not self.get_expression(knob)[dimension]:
+            return
 
-        for widget in get_all_widgets(QApplication.activeWindow()):
-            if not widget.metaObject().className() == 'ErrorOutput':
-                continue
+        result = evaluate_cached(self.current_node, knob, code, 'tcl')
+        print(result)
 
-            return widget
+        return 'tcl error' if result.error else 'ok'
 
-        return None
+    @contextmanager
+    def editor_expression(self, knob, dimension):
+        expr = self.get_expression(knob)[dimension]
+        code = self.editor.get_code(dimension)
+        syntax = self.editor.get_syntax(dimension)
 
-    def execute_tcl(self, code, dimension):
+        expr_dimension = -1 if knob.singleValue() else dimension
+        changed = not (code == expr['value'] and syntax == expr['syntax'])
+
+        # get_expression is lossy, the raw expression is put back as it was,
+        # and the temporary one is never compiled so the hidden sources of
+        # the node are not touched
+        raw = self.get_raw_expression(knob)[dimension]
+
+        nuke.Undo.disable()
+        self.activated_knob_changed = False
+
+        try:
+            if changed:
+                knob.setExpression(build_expression(code, syntax), expr_dimension)
+            yield
+        finally:
+            if changed:
+                knob.setExpression(raw, expr_dimension)
+
+            self.activated_knob_changed = True
+            nuke.Undo.enable()
+
+    def evaluate_range(self, frame_range=''):
+        knob = self.current_knob
+        dimension = self.editor.get_focus_dimension()
+
+        if not knob or not self.get_expression(knob)[dimension]:
+            print('Evaluate over range needs an expression knob !')
+            return
+
+        first, last = parse_frame_range(frame_range)
+
+        code = self.editor.get_code(dimension)
+        syntax = self.editor.get_syntax(dimension)
+
+        batch = evaluate_vectorized(code, first, last) if syntax == 'tcl' else None
+
+        if batch:
+            values, times = batch
+        else:
+            with self.editor_expression(knob, dimension):
+                values, times = evaluate_range(knob, dimension, first, last)
+
+        label = '{}.{}'.format(self.current_node.name(), knob.name())
+        if not knob.singleValue():
+            label += '[{}]'.format(dimension)
+
+        print(range_report(label, values, times, first, last, bool(batch)))
+
+    def bake(self, frame_range=''):
+        node = self.current_node
+        knob = self.current_knob
+
+        if not knob or not any(self.get_expression(knob)):
+            print('Bake needs an expression knob !')
+            return
+
+        if not self.check_and_save():
+            return
+
+        first, last = parse_frame_range(frame_range)
+        raw_exprs = self.get_raw_expression(knob)
+        dimensions = [d for d, expr in enumerate(raw_exprs) if expr]
+
+        exprs = self.get_expression(knob)
+
+        baked = {}
+        for dimension in dimensions:
+            expr = exprs[dimension]
+            batch = None
+
+            if expr and expr['syntax'] == 'tcl':
+                batch = evaluate_vectorized(expr['value'], first, last)
+
+            if batch:
+                baked[dimension] = batch[0]
+            else:
+                baked[dimension], _ = evaluate_range(
+                    knob, dimension, first, last)
+
+        self.activated_knob_changed = False
+        nuke.Undo.begin('Bake {}.{}'.format(node.name(), knob.name()))
+
+        try:
+            if self.state['keep_baked_source']:
+                store_source(node, knob, raw_exprs)
+
+            skipped = 0
+            for dimension in dimensions:
+                skipped += bake_values(knob, dimension, first, baked[dimension])
+        finally:
+            nuke.Undo.end()
+            self.activated_knob_changed = True
+
+        print('{}.{} baked from frame {} to {}{}'.format(
+            node.name(), knob.name(), first, last,
+            ', {} non finite values skipped'.format(skipped) if skipped else ''))
+
+        nodes = self.current_nodes
+        self.exit_node(True)
+        self.enter(node, nodes=nodes)
+
+    def unbake(self):
+        node = self.current_node
         knob = self.current_knob
+
         if not knob:
             return
 
-        expr = self.get_expression(knob)[dimension]
-        if not expr:
+        self.activated_knob_changed = False
+        nuke.Undo.begin('Unbake {}.{}'.format(node.name(), knob.name()))
+
+        try:
+            restored = unbake(node, knob)
+        finally:
+            nuke.Undo.end()
+            self.activated_knob_changed = True
+
+        if not restored:
+            print('{}.{} has no baked source !'.format(node.name(), knob.name()))
             return
 
-        aux = expr['value']
+        nodes = self.current_nodes
+        self.exit_node(True)
+        self.enter(node, knob, nodes=nodes)
+
+    def convert_to_tcl(self):
+        node = self.current_node
+        knob = self.current_knob
+        dimension = self.editor.get_focus_dimension()
+
+        if not knob or not self.get_expression(knob)[dimension]:
+            print('Convert to Tcl needs an expression knob !')
+            return
 
         code = self.editor.get_code(dimension)
-        self.set_expression(knob, code, 'tcl', dimension)
 
-        if type(knob) == nuke.Boolean_Knob:
-            result = knob.value()
-        else:
-            result = knob.value(dimension)
+        if not self.editor.get_syntax(dimension) == 'python':
+            print('The expression is already Tcl !')
+            return
+
+        tcl_code = python_to_tcl(code)
+        if not tcl_code:
+            print('The expression uses python that has no Tcl equivalent !')
+            return
+
+        python_result, python_time = measure(node, knob, code, 'python')
+        tcl_result, tcl_time = measure(node, knob, tcl_code, 'tcl')
+
+        print('python: {} ( {:.4f} ms )'.format(python_result, python_time * 1000))
+        print('tcl:    {} ( {:.4f} ms )'.format(tcl_result, tcl_time * 1000))
+
+        if python_result.error or tcl_result.error:
+            return
+
+        if abs(float(python_result.value) - float(tcl_result.value)) > 1e-9:
+            print('The Tcl expression gives a different value, it will not be converted !')
+            return
+
+        speedup = python_time / tcl_time if tcl_time else 0
+        msg = 'Replace the python expression with:\n\n{}\n\nTcl is {:.1f}x faster, continue ?'.format(
+            tcl_code, speedup)
+
+        if not nuke.ask(msg):
+            return
+
+        expr_dimension = -1 if knob.singleValue() else dimension
+        self.set_expression(knob, tcl_code, 'tcl', expr_dimension)
 
-        error_console = self.get_nuke_error_console()
-        error = error_console.toPlainText().strip() if error_console else ''
+        nodes = self.current_nodes
+        self.exit_node(True)
+        self.enter(node, knob, nodes=nodes)
+
+    def profile_expressions(self, samples=''):
+        samples = int(samples) if samples.isdigit() else 10
+
+        start = time.time()
+        results, frames = profile_comp(self, samples)
+        elapsed = time.time() - start
+
+        if not self.profiler:
+            self.profiler = profiler_widget(self)
 
-        key = re.sub('\\s+', ' ', code)
+        self.profiler.set_results(results, frames, elapsed)
+        self.profiler.show()
+        self.profiler.raise_()
 
-        if error_console and error:
-            err = error.splitlines()[-1].split(':', 2)[-1]
-            err = 'ERROR:{}'.format(err)
-            print(err)
-            self.tcl_errors[key] = err
-            error_console.clear()
+    def show_dependencies(self, rebuild=''):
+        show_dependencies(self, rebuild == 'rebuild')
 
-        elif key in self.tcl_errors:
-            print(self.tcl_errors[key])
+    def search_comp(self, query=''):
+        if not index.built and not index.indexing():
+            index.start(self)
 
+        if not self.knob_search:
+            self.knob_search = knob_search_widget(self)
+
+        self.knob_search.show()
+        self.knob_search.raise_()
+        self.knob_search.set_query(query)
+
+    def replace_in_comp(self, args=''):
+        words = args.split()
+
+        if len(words) == 2:
+            search, replace = words
         else:
-            print(result)
+            search = nuke.getInput('Replace in the comp:')
+            if not search:
+                return
 
-        self.set_expression(knob, aux, 'tcl', dimension)
+            replace = nuke.getInput("Replace '{}' with:".format(search))
+            if replace is None:
+                return
+
+        start = time.time()
+        hits = find_hits(self, search, replace)
+        elapsed = time.time() - start
+
+        if not hits:
+            print("'{}' not found in the comp".format(search))
+            return
+
+        if not self.replace_preview:
+            self.replace_preview = replace_widget(self)
+
+        self.replace_preview.set_hits(search, replace, hits, elapsed)
+        self.replace_preview.show()
+        self.replace_preview.raise_()
+
+    def apply_replace(self, search, replace, hits):
+        if not self.check_and_save():
+            return
 
+        start = time.time()
+        applied, failed = apply_hits(
+            self, hits, "Replace '{}' with '{}'".format(search, replace))
 
-    def execute_python(self, code):
+        print("'{}' -> '{}' : {} replacements in {} knobs in {:.2f}s".format(
+            search, replace, sum(h['count'] for h in applied), len(applied),
+            time.time() - start))
+
+        for hit, error in failed:
+            print('    skipped {}.{} : {}'.format(hit['node'], hit['knob'], error))
+
+        self.refresh_knobs([find_knob(h['node'], h['knob']) for h in applied])
+
+        if any(h['node'] == self.current_node_name for h in applied):
+            node = self.current_node
+            nodes = self.current_nodes
+
+            self.exit_node(True)
+            self.enter(node, nodes=nodes)
+
+    def refresh_knobs(self, knobs):
+        # the knobChanged hooks of the index and the graph are suspended
+        # during batched writes, the written knobs are updated afterwards
+        for knob in knobs:
+            if not knob:
+                continue
+
+            if index.scripter:
+                index.update_knob(knob.node(), knob)
+
+            if graph.built:
+                graph.update_knob(knob.node(), knob)
+
+    def reset_namespace(self, pages=''):
+        if pages == 'all':
+            page_namespaces.reset()
+            print('the namespaces of all pages were reset')
+            return
+
+        page = self.state['current_page']
+        page_namespaces.reset(page)
+        print('the namespace of page {} was reset'.format(page + 1))
+
+    def execute_python(self, code, first_line=0, persistent=None, profiler=None):
         run_context = 'root'
+        globals_dict = None
+
+        if persistent is None:
+            persistent = self.state['persistent_namespaces']
 
         if self.current_node and self.current_knob:
             run_context = "{}.{}".format(
@@ -702,30 +1090,162 @@ class scripter_widget(QWidget):
         else:
             self.save_state()
 
-        python_code = "exec('''{}''')".format(
-            code.replace("\\", "\\\\").replace("'", "\\'"))
+            if persistent:
+                globals_dict = page_namespaces.namespace(
+                    self.state['current_page'])
+
+        filename = execution.pseudo_path(self.run_label())
 
-        if not version_info.major == 3:
-            python_code = python_code.replace('\n', '\\n').replace(
-                '"', '\\"').replace("'", "\\'")
+        capture = self.state['capture_output']
+        if capture:
+            self.console.start_capture()
 
-            python_code = 'eval(compile("{}", "", "exec"))'.format(
-                python_code)
+        status = 'ok'
+        fast = self.state['fast_run']
+        start = time.time()
 
         try:
-            nuke.runIn(run_context, python_code)
+            code_object = execution.compile_code(code, filename, first_line)
+
+            with fast_run(self, fast):
+                execution.execute(
+                    run_context, code_object, globals_dict, profiler)
         except:
-            tb = str(traceback.format_exc())
-            self.console.add_output(tb)
+            status = 'traceback'
+
+            self.console.add_output(execution.format_error(filename))
+
+            line_number = execution.error_line(filename)
+            if line_number:
+                self.editor.set_line_error(line_number)
+
+        finally:
+            if capture:
+                self.console.stop_capture()
+
+        if fast:
+            # the scripter did not see the knob changes of the run
+            results.clear()
+
+        if status == 'ok':
+            self.report_run_time(code, fast, time.time() - start)
+
+        return status
+
+    def report_run_time(self, code, fast, elapsed):
+        key = source_hash(code)
+
+        if not fast:
+            self.run_times.set(key, elapsed)
+            return
+
+        normal = self.run_times.get(key)
+
+        if normal is None:
+            print('fast run: {:.3f}s ( run it once without fast run to compare )'.format(elapsed))
+            return
+
+        print('fast run: {:.3f}s, normal run: {:.3f}s, {:.3f}s saved'.format(
+            elapsed, normal, normal - elapsed))
+
+    def execute_for_each_node(self):
+        if self.current_node:
+            print('Run for each node works with script pages, exit the node first !')
+            return
+
+        nodes = nuke.selectedNodes()
+        if not nodes:
+            print('Select the nodes to run the page on !')
+            return
+
+        dimension = self.editor.get_focus_dimension()
+        code = self.editor.get_code(dimension)
+
+        if not code.strip() or not self.editor.get_syntax(dimension) == 'python':
+            return
+
+        self.save_state()
+
+        section = self.console.begin_section('{} x {} nodes'.format(
+            self.run_label(), len(nodes)), 'python')
+
+        filename = execution.pseudo_path(self.run_label())
+
+        try:
+            code_object = execution.compile_code(code, filename)
+        except SyntaxError:
+            self.console.add_output(execution.format_error(filename))
+            self.console.end_section(section, 'traceback')
+            return
+
+        globals_dict = None
+        if self.state['persistent_namespaces']:
+            globals_dict = page_namespaces.namespace(self.state['current_page'])
+
+        failed = []
+        start = time.time()
+
+        capture = self.state['capture_output']
+        if capture:
+            self.console.start_capture()
+
+        label = 'Run page {} on {} nodes'.format(
+            self.state['current_page'] + 1, len(nodes))
+
+        try:
+            with undo_group(label), suspended_repaint(), \
+                    deferred_callbacks(self) as recorder:
+
+                for node in nodes:
+                    node_name = node.fullName()
 
-            line_number = tb.rsplit('line', 1)[-1].strip().split(' ')[0]
-            line_number = ''.join(
-                [c if c.isdigit() else '' for c in line_number])
+                    try:
+                        execution.execute(node_name, code_object, globals_dict)
+                    except:
+                        failed.append((node_name, execution.format_error(filename)))
+        finally:
+            if capture:
+                self.console.stop_capture()
 
-            line_number = int(line_number)
-            self.editor.set_line_error(line_number)
+        elapsed = time.time() - start
 
-    def execute_script(self):
+        # outside the undo group, what the callbacks change is its own undo step
+        callbacks_failed = recorder.replay()
+
+        if failed:
+            self.console.add_output(failed[0][1])
+
+        for node_name, tb in failed:
+            error = tb.strip().split('\n')[-1]
+            print('    failed {} : {}'.format(node_name, error))
+
+        print('page run on {} nodes in {:.3f}s ( {:.3f} ms per node ), {} failed'.format(
+            len(nodes), elapsed, elapsed / len(nodes) * 1000, len(failed)))
+
+        print('knobChanged callbacks replayed on {} knobs, {} failed'.format(
+            len(recorder.touched), callbacks_failed))
+
+        self.console.end_section(section, 'traceback' if failed else 'ok')
+
+    def profile_script(self, top=''):
+        dimension = self.editor.get_focus_dimension()
+
+        if not self.editor.get_syntax(dimension) == 'python':
+            print('Only python can be profiled !')
+            return
+
+        self.execute_script(int(top) if top.isdigit() else 20)
+
+    def line_profile_script(self):
+        dimension = self.editor.get_focus_dimension()
+
+        if not self.editor.get_syntax(dimension) == 'python':
+            print('Only python can be profiled !')
+            return
+
+        self.execute_script(line_profile=True)
+
+    def execute_script(self, profile_top=0, line_profile=False):
         dimension = self.editor.get_focus_dimension()
         code = self.editor.get_code(dimension)
 
@@ -733,12 +1253,115 @@ class scripter_widget(QWidget):
             return
 
         syntax = self.editor.get_syntax(dimension)
+        label = self.run_label()
+        first_line = 0
 
-        if syntax == 'blink' and self.current_node:
-            self.save()
+        # with persistent namespaces the selected lines of a page can run alone,
+        # they reuse what the previous runs of the page loaded
+        if syntax == 'python' and not self.current_node \
+                and self.state['persistent_namespaces']:
+            selected, first_line = self.editor.get_selection(dimension)
 
-        elif syntax == 'python':
-            self.execute_python(code)
+            if selected.strip():
+                code = selected
+                label = '{} lines {}-{}'.format(
+                    label, first_line + 1, first_line + code.count('\n') + 1)
 
-        else:
-            self.execute_tcl(code, dimension)
+        section = self.console.begin_section(label, syntax)
+        status = 'ok'
+
+        try:
+            if syntax == 'blink' and self.current_node:
+                self.save()
+
+            elif syntax == 'python':
+                profiler = None
+
+                if profile_top:
+                    profiler = cProfile.Profile()
+                elif line_profile:
+                    profiler = line_profiler()
+
+                status = self.execute_python(code, first_line, profiler=profiler)
+
+                if profile_top:
+                    path = stats_path(self.state_file, label)
+                    self.console.add_output(profile_report(profiler, profile_top, path))
+
+                elif line_profile:
+                    self.editor.set_line_times(profiler.line_times(), dimension)
+                    self.console.add_output(
+                        profiler.report(self.editor.get_code(dimension)))
+
+                # a complete run of the page is also a run of all its cells
+                whole_page = code == self.editor.get_code(dimension)
+                if status == 'ok' and whole_page and not self.current_node \
+                        and self.state['persistent_namespaces']:
+
+                    for cell in split_cells(code):
+                        page_namespaces.cell_succeeded(self.state['current_page'], cell)
+
+            else:
+                status = self.execute_tcl(code, dimension)
+
+        except Exception:
+            status = 'traceback'
+            raise
+
+        finally:
+            self.console.end_section(section, status or 'ok')
+
+    def page_cells(self):
+        if self.current_node:
+            print('Cells work with script pages, exit the node first !')
+            return None
+
+        if not self.editor.get_syntax(0) == 'python':
+            return None
+
+        return split_cells(self.editor.get_code(0))
+
+    def execute_cell(self):
+        cells = self.page_cells()
+        if not cells:
+            return
+
+        line = self.editor.get_editor().textCursor().blockNumber()
+        self.run_cells([cell_at_line(cells, line)])
+
+    def execute_changed_cells(self):
+        cells = self.page_cells()
+        if not cells:
+            return
+
+        changed = page_namespaces.changed_cells(self.state['current_page'], cells)
+
+        if not changed:
+            print('No cell has changed since its last run')
+            return
+
+        self.run_cells(changed)
+
+    def run_cells(self, cells):
+        # cells always run in the namespace of the page,
+        # the previous cells left there what the next ones need
+        page = self.state['current_page']
+
+        for cell in cells:
+            section = self.console.begin_section(
+                '{} {}'.format(self.run_label(), cell.label()), 'python')
+
+            status = self.execute_python(cell.code, cell.first_line, True)
+            self.console.end_section(section, status)
+
+            if not status == 'ok':
+                break
+
+            page_namespaces.cell_succeeded(page, cell)
+
+    def run_label(self):
+        if self.current_node and self.current_knob:
+            return '{}.{}'.format(
+                self.current_node.name(), self.current_knob.name())
+
+        return 'page {}'.format(self.state['current_page'] + 1)
@@ -0,0 +1,10 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+import time
+
+# time.time ticks every ~15.6 ms on Windows, too coarse for the
+# microseconds of a single expression or line
+timer = getattr(time, 'perf_counter', time.time)
@@ -7,7 +7,9 @@
 
 import os
 from ..nuke_util.pyside import (
+    Qt,
     QWidget,
+    QMenu,
     QPushButton,
     QHBoxLayout,
     QComboBox,
@@ -40,8 +42,12 @@ class toolbar_widget(QWidget):
         exec_script_button = QPushButton()
         exec_script_button.setIcon(
             QIcon('{}/icon_run.png'.format(icons_path)))
-        exec_script_button.setToolTip('Execute current Knob')
+        exec_script_button.setToolTip(
+            'Execute current Knob\nRight click for more run options')
         exec_script_button.clicked.connect(self.parent.execute_script)
+        exec_script_button.setContextMenuPolicy(Qt.CustomContextMenu)
+        exec_script_button.customContextMenuRequested.connect(
+            lambda pos: self.show_run_menu(exec_script_button, pos))
 
         clean_output_button = QPushButton()
         clean_output_button.setIcon(
@@ -72,6 +78,24 @@ class toolbar_widget(QWidget):
         layout.addWidget(clean_output_button)
         layout.addWidget(self.vim_mode_button)
 
+    def show_run_menu(self, button, pos):
+        menu = QMenu(self)
+
+        for name, state_key, label in self.parent.options:
+            action = menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(self.parent.state[state_key])
+            action.toggled.connect(
+                lambda checked, name=name: self.parent.set_option(name, checked))
+
+        menu.addSeparator()
+
+        for label, action_func in self.parent.run_actions:
+            action = menu.addAction(label)
+            action.triggered.connect(lambda _=False, f=action_func: f())
+
+        menu.exec_(button.mapToGlobal(pos))
+
     def node_edit_mode(self, active):
         self.node_edit_widget.setVisible(active)
         self.page_buttons_widget.setVisible(not active)
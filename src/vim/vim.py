@@ -40,7 +40,29 @@ class vim_widget(QWidget):
                                      '1, 2, 3... : Go to line\n'
                                      '/ : Search\n'
                                      '%s/src/dst/g : Search and replace\n'
-                                     'retab : Change the indentation to 4 spaces'
+                                     'retab : Change the indentation to 4 spaces\n'
+                                     'set capture, set nocapture : Capture script output\n'
+                                     'set compiled, set nocompiled : Save python expressions compiled\n'
+                                     'set fastrun, set nofastrun : Suspend callbacks, autosave and redraw while running\n'
+                                     'set persistent, set nopersistent : Keep the variables of each page between runs\n'
+                                     'reset [all] : Reset the namespace of the page\n'
+                                     'profile [n] : Run under cProfile and print the n slowest functions\n'
+                                     'lineprofile : Run timing every line, the times are shown next to the line numbers\n'
+                                     'cell : Run the # %% cell under the cursor ( Ctrl+Shift+Enter )\n'
+                                     'cells : Run the cells changed since their last run\n'
+                                     'sections [ok|error|traceback|tcl] : List the runs in the console\n'
+                                     'section <n> : Show the output of a run\n'
+                                     'find <words> : Search the console output\n'
+                                     'tail : Back to the live console output\n'
+                                     'range [first last] : Evaluate the expression over a frame range\n'
+                                     'bake [first last] : Bake the expression to keyframes\n'
+                                     'unbake : Restore the baked expression\n'
+                                     'totcl : Convert the python expression to Tcl\n'
+                                     'exprprofile [samples] : Profile every expression of the comp\n'
+                                     'deps [rebuild] : Cycles, deepest chains and fan-in of expression references\n'
+                                     'search [words] : Search the code of all knobs of the comp\n'
+                                     'replace [src dst] : Replace a symbol in all the code of the comp\n'
+                                     'foreach : Run the page once for each selected node'
                                      )
 
         layout.addWidget(self.mode_label)
@@ -59,7 +81,38 @@ class vim_widget(QWidget):
             'tabnew': scripter.add_page,
             'tabclose': scripter.remove_current_page,
             'tabo': scripter.clean_all_pages,
-            'retab': self.retab
+            'retab': self.retab,
+            'sections': lambda: scripter.console.show_sections(),
+            'tail': lambda: scripter.console.show_tail(),
+            'range': scripter.evaluate_range,
+            'bake': scripter.bake,
+            'unbake': scripter.unbake,
+            'totcl': scripter.convert_to_tcl,
+            'exprprofile': lambda: scripter.profile_expressions(),
+            'deps': lambda: scripter.show_dependencies(),
+            'search': lambda: scripter.search_comp(),
+            'replace': lambda: scripter.replace_in_comp(),
+            'foreach': scripter.execute_for_each_node,
+            'reset': lambda: scripter.reset_namespace(),
+            'profile': lambda: scripter.profile_script(),
+            'lineprofile': scripter.line_profile_script,
+            'cell': scripter.execute_cell,
+            'cells': scripter.execute_changed_cells
+        }
+
+        self.arg_commands = {
+            'set': scripter.set_option,
+            'sections': lambda status: scripter.console.show_sections(status),
+            'section': lambda number: scripter.console.show_section(number),
+            'find': lambda query: scripter.console.find(query),
+            'range': scripter.evaluate_range,
+            'bake': scripter.bake,
+            'exprprofile': scripter.profile_expressions,
+            'deps': scripter.show_dependencies,
+            'search': scripter.search_comp,
+            'replace': scripter.replace_in_comp,
+            'reset': scripter.reset_namespace,
+            'profile': scripter.profile_script
         }
 
     def set_mode(self, mode):
@@ -199,11 +252,15 @@ class vim_widget(QWidget):
         elif command.isdigit():
             self.go_to_line(int(command))
 
-        elif not command in self.commands:
-            print("'{}' command does not exist !".format(command))
+        elif command in self.commands:
+            self.commands[command]()
+
+        elif command.split(' ', 1)[0] in self.arg_commands:
+            name, _, args = command.partition(' ')
+            self.arg_commands[name](args.strip())
 
         else:
-            self.commands[command]()
+            print("'{}' command does not exist !".format(command))
 
     def write_command(self, prefix):
         self.command_line.setFocus()
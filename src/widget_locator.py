@@ -0,0 +1,68 @@
+# -----------------------------------------------------------
+# AUTHOR --------> Francisco Contreras
+# OFFICE --------> Senior VFX Compositor, Software Developer
+# WEBSITE -------> https://vinavfx.com
+# -----------------------------------------------------------
+from ..nuke_util.pyside import QApplication, QSplitter
+
+# The widgets are owned by Nuke, holding their wrapper does not keep
+# them alive, 'destroyed' drops the entry before it becomes dangling.
+located_widgets = {}
+
+
+def forget(name):
+    located_widgets.pop(name, None)
+
+
+def locate(name, finder):
+    widget = located_widgets.get(name)
+
+    if widget:
+        try:
+            widget.objectName()
+            return widget
+        except RuntimeError:
+            forget(name)
+
+    widget = finder()
+    if not widget:
+        return None
+
+    located_widgets[name] = widget
+    widget.destroyed.connect(lambda: forget(name))
+
+    return widget
+
+
+def find_by_class(class_name, widgets=None):
+    if widgets is None:
+        widgets = QApplication.allWidgets()
+
+    for widget in widgets:
+        if widget.metaObject().className() == class_name:
+            return widget
+
+    return None
+
+
+def find_nuke_console():
+    se = get_nuke_script_editor()
+
+    if not se:
+        return None
+
+    splitter = [w for w in se.children() if isinstance(w, QSplitter)]
+
+    if not splitter:
+        return None
+
+    return find_by_class(
+        'Foundry::PythonUI::ScriptOutputWidget', splitter[0].children())
+
+
+def get_nuke_script_editor():
+    return locate('script_editor', lambda: find_by_class('Nuke::NukeScriptEditor'))
+
+
+def get_nuke_console():
+    return locate('console', find_nuke_console)